@@ -0,0 +1,19 @@
+"""Shared runtime helpers for the agent UIs (Streamlit, load tests)."""
+from .batching import AsyncMicroBatcher, MicroBatcher
+from .conversation import ChatSession, TurnEvent, chat_config
+from .event_loop import BackgroundLoop
+from .history import HistoryManager, estimate_tokens
+from .streaming import RenderCoalescer, StatusChannel
+
+__all__ = [
+    "AsyncMicroBatcher",
+    "BackgroundLoop",
+    "ChatSession",
+    "HistoryManager",
+    "MicroBatcher",
+    "RenderCoalescer",
+    "StatusChannel",
+    "TurnEvent",
+    "chat_config",
+    "estimate_tokens",
+]
@@ -0,0 +1,130 @@
+"""
+The non-UI core of a chat turn, shared by the Streamlit app and the load test.
+Each turn tries the agent's direct router, then picks a model route, keeps the
+async genai chat on that model within the history token budget, and streams
+the reply.
+"""
+
+import time
+from typing import AsyncIterator, List, NamedTuple, Tuple
+
+from .history import HistoryManager, Message
+
+
+def chat_config(agent):
+    """Map an ADK agent's instruction and tools to a GenerateContentConfig."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        system_instruction=getattr(agent, "instruction", None),
+        tools=getattr(agent, "tools", None),
+        temperature=0.3,
+        automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=False),
+    )
+
+
+class TurnEvent(NamedTuple):
+    """A piece of a reply: text to show and/or names of tools called while producing it."""
+    text: str = ""
+    tool_calls: Tuple[str, ...] = ()
+
+
+class ChatSession:
+    """One user's conversation with a loaded agent over a genai async chat.
+
+    The chat keeps its own history and is appended to by every turn. Stored
+    messages are only replayed when the chat is (re)created: on first use, or
+    when its history would exceed the agent's token budget, in which case it is
+    rebuilt from a compacted history (recent turns verbatim, older ones summarized).
+
+    Args:
+        client: genai.Client used for the chat.
+        loaded: The agent, as loaded by agent_runtime.registry.
+        history: HistoryManager enforcing the agent's token budget.
+        config: Base GenerateContentConfig; defaults to `chat_config(loaded.agent)`.
+        model_routing: Route each request with the agent's ModelRouter, if it has one.
+    """
+
+    def __init__(self, client, loaded, history: HistoryManager, config=None, model_routing: bool = True):
+        self.client = client
+        self.loaded = loaded
+        self.history = history
+        self.config = config if config is not None else chat_config(loaded.agent)
+        self.model_router = loaded.model_router if model_routing else None
+        self.model = loaded.agent.model
+        self.chat = None
+        self.tokens = 0
+        # How the latest turn was answered
+        self.direct = False
+        self.decision = None
+
+    def _create_chat(self, history: List) -> None:
+        self.chat = self.client.aio.chats.create(model=self.model, history=history, config=self.config)
+
+    def _prepare(self, message: str, messages: List[Message]) -> None:
+        from google.genai import types
+
+        pending = self.history.count_tokens(message)
+        if self.chat is None or self.history.over_budget(self.tokens + pending):
+            compacted = self.history.compact(messages)
+            self._create_chat([
+                types.Content(role="user" if msg["role"] == "user" else "model",
+                              parts=[types.Part(text=msg["content"])])
+                for msg in compacted
+            ])
+            self.tokens = self.history.count(compacted)
+        self.tokens += pending
+
+    async def reply(self, message: str, messages: List[Message]) -> AsyncIterator[TurnEvent]:
+        """Answer `message`, yielding the reply as it streams.
+
+        Args:
+            message: The new user message.
+            messages: Earlier {"role", "content"} messages of the conversation,
+                replayed only when the chat is (re)created.
+        """
+        from google.genai import types
+
+        self._prepare(message, messages)
+        self.direct, self.decision = False, None
+
+        router = self.loaded.direct_router
+        answer = await router(message) if router is not None else None
+        if answer is not None:
+            self.direct = True
+            # Keep the chat's own history in step with the conversation. Rebuilding the
+            # chat (no network call) avoids record_history, whose signature differs
+            # between google-genai releases.
+            self._create_chat(self.chat.get_history() + [
+                types.Content(role="user", parts=[types.Part(text=message)]),
+                types.Content(role="model", parts=[types.Part(text=answer)]),
+            ])
+            self.tokens += self.history.count_tokens(answer)
+            yield TurnEvent(answer)
+            return
+
+        # Pick the model tier and output budget for this request
+        config = None
+        if self.model_router is not None:
+            depth = sum(msg["role"] == "user" for msg in messages)
+            self.decision = await self.model_router.route(message, depth)
+            if self.decision.route.model != self.model:
+                # A chat is bound to one model; carry its history over to the routed one
+                self.model = self.decision.route.model
+                self._create_chat(self.chat.get_history())
+            config = self.model_router.config_for(self.decision, self.config)
+
+        start = time.perf_counter()
+        usage = None
+        text: List[str] = []
+        async for chunk in await self.chat.send_message_stream(message, config=config):
+            if chunk.usage_metadata:
+                usage = chunk.usage_metadata
+            tool_calls = tuple(call.name for call in chunk.function_calls or ())
+            if chunk.text or tool_calls:
+                text.append(chunk.text or "")
+                yield TurnEvent(chunk.text or "", tool_calls)
+        if self.decision is not None:
+            self.model_router.record(self.decision.name, time.perf_counter() - start, usage)
+        self.tokens += self.history.count_tokens("".join(text))
+
@@ -0,0 +1,76 @@
+"""
+Data-driven tool payloads.
+Tool responses are loaded from YAML/JSON files into frozen, shareable
+objects and reloaded only when the file's mtime changes.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+
+class FrozenDict(dict):
+    """A dict that rejects mutation, so a cached payload can be shared safely."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through the constructor, not __setitem__
+        return (type(self), (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _parse(path: str, text: str) -> Any:
+    if path.endswith((".yaml", ".yml")):
+        import yaml  # only needed for YAML payloads
+
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+class DataFile:
+    """A YAML/JSON file cached as a frozen payload.
+
+    The file is re-read only when its mtime changes; mtime is checked at most
+    once every `check_interval` seconds so hot calls cost a clock read.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._payload: Any = None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._mtime is not None:
+            return
+        with self._lock:
+            self._checked_at = now
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._mtime:
+                return
+            with open(self.path, encoding="utf-8") as f:
+                payload = _parse(self.path, f.read())
+            self._payload = freeze(payload)
+            self._mtime = mtime
+
+    def get(self) -> Any:
+        """The frozen payload (shared; do not copy per call)."""
+        self._refresh()
+        return self._payload
@@ -0,0 +1,40 @@
+"""
+Long-lived asyncio event loop on a background thread.
+Async clients keep their connection pools bound to one loop, so reusing a
+single loop across Streamlit reruns keeps those pools warm.
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An event loop running forever on a daemon thread.
+
+    Coroutines are submitted from synchronous code (e.g. a Streamlit script)
+    and awaited there, so UI calls stay on the caller's thread.
+    """
+
+    def __init__(self, name: str = "agent-runtime-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run `coro` on the background loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Consume an async iterator from synchronous code, one item at a time."""
+        while True:
+            try:
+                yield self.run(agen.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
@@ -0,0 +1,83 @@
+"""
+Token-budgeted chat history compaction.
+Keeps recent turns verbatim and folds older ones into a short extractive
+summary so prompt size stays bounded in long conversations.
+"""
+
+from typing import Callable, Dict, List
+
+Message = Dict[str, str]
+
+SUMMARY_PREFIX = "Summary of earlier conversation:"
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate (~4 characters per token for English text)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+class HistoryManager:
+    """Enforces a prompt token budget on {"role", "content"} message lists.
+
+    Args:
+        token_budget: Maximum estimated tokens of history sent with a request.
+        compact_to: Fraction of the budget to compact down to, leaving headroom
+            so compaction (and the chat rebuild it triggers) is not needed every turn.
+        summary_share: Fraction of the compacted size reserved for the summary.
+        snippet_chars: Characters kept from each summarized message.
+        count_tokens: Token counter; defaults to a local estimate.
+    """
+
+    def __init__(self, token_budget: int, compact_to: float = 0.6, summary_share: float = 0.25,
+                 snippet_chars: int = 160, count_tokens: Callable[[str], int] = estimate_tokens):
+        self.token_budget = token_budget
+        self.compact_to = compact_to
+        self.summary_share = summary_share
+        self.snippet_chars = snippet_chars
+        self.count_tokens = count_tokens
+
+    def count(self, messages: List[Message]) -> int:
+        return sum(self.count_tokens(msg["content"]) for msg in messages)
+
+    def over_budget(self, tokens: int) -> bool:
+        return tokens > self.token_budget
+
+    def compact(self, messages: List[Message]) -> List[Message]:
+        """Return `messages` reduced to at most `compact_to * token_budget` tokens.
+
+        The newest messages are kept verbatim; older ones become one summary
+        message built from per-message snippets (oldest dropped first).
+        """
+        target = int(self.token_budget * self.compact_to)
+        if self.count(messages) <= target:
+            return list(messages)
+
+        summary_budget = int(target * self.summary_share)
+        recent: List[Message] = []
+        used = 0
+        for msg in reversed(messages):
+            tokens = self.count_tokens(msg["content"])
+            if used + tokens > target - summary_budget:
+                break
+            recent.append(msg)
+            used += tokens
+        recent.reverse()
+        older = messages[:len(messages) - len(recent)]
+
+        lines: List[str] = []
+        summary_tokens = self.count_tokens(SUMMARY_PREFIX)
+        for msg in reversed(older):
+            speaker = "User" if msg["role"] == "user" else "Assistant"
+            text = " ".join(msg["content"].split())
+            if len(text) > self.snippet_chars:
+                text = text[:self.snippet_chars].rstrip() + "..."
+            line = f"- {speaker}: {text}"
+            tokens = self.count_tokens(line)
+            if summary_tokens + tokens > summary_budget:
+                break
+            lines.append(line)
+            summary_tokens += tokens
+        if not lines:
+            return recent
+        lines.reverse()
+        return [{"role": "user", "content": "\n".join([SUMMARY_PREFIX, *lines])}] + recent
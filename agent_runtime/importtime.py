@@ -0,0 +1,60 @@
+"""
+Import-time profiling (`python -X importtime` style).
+
+Usage:
+    python -m agent_runtime.importtime greeting_agent thoughtful_ai_agent
+    python -m agent_runtime.importtime --top 15 streamlit
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(module: str, python: str = sys.executable) -> List[ImportTiming]:
+    """Import `module` in a fresh interpreter with -X importtime and parse the report."""
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()[-500:]}")
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def format_report(module: str, timings: List[ImportTiming], top: int = 10) -> str:
+    total = next((t.cumulative_us for t in reversed(timings) if t.module == module), 0)
+    lines = [f"{module}: {total / 1000:.1f} ms total",
+             f"  {'cumulative ms':>13}  {'self ms':>8}  module"]
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {t.cumulative_us / 1000:13.1f}  {t.self_us / 1000:8.1f}  {t.module}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report the slowest imports of each module.")
+    parser.add_argument("modules", nargs="+")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    for module in args.modules:
+        print(format_report(module, profile_imports(module), args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Lightweight metrics for agent tools.
+Counters and histograms in a process-wide registry, rendered in Prometheus
+text format, with optional OpenTelemetry spans. When disabled, instrumented
+tools pay one flag check per call.
+
+Enable with AGENT_METRICS=1; set AGENT_METRICS_PORT to serve /metrics and
+AGENT_METRICS_OTEL=1 to emit spans (requires opentelemetry-api).
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _truthy(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels."""
+
+    def __init__(self):
+        self.enabled = False
+        self.otel = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS,
+                **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callback producing gauge samples at scrape time (no hot-path cost)."""
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+        gauges: Dict[str, List[str]] = {}
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                gauges.setdefault(name, []).append(f"{name}{_labels(tuple(sorted(labels.items())))} {value:g}")
+        for name, samples in sorted(gauges.items()):
+            self._header(lines, name, "gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("agent_tool_calls_total", "Agent tool invocations by tool and status.")
+REGISTRY.describe("agent_tool_latency_seconds", "Agent tool wall-clock latency.")
+
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+render_prometheus = REGISTRY.render_prometheus
+
+
+@contextmanager
+def timed(name: str, **labels: str):
+    """Observe the duration of the enclosed block into histogram `name`."""
+    if not REGISTRY.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """OpenTelemetry span when AGENT_METRICS_OTEL is on and the API is installed; no-op otherwise."""
+    if not (REGISTRY.enabled and REGISTRY.otel):
+        yield None
+        return
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        yield None
+        return
+    with trace.get_tracer("agent_runtime").start_as_current_span(name, attributes=attributes) as s:
+        yield s
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """Record call counts, errors and latency for an agent tool (sync or async).
+
+    The wrapper preserves the name, docstring and signature ADK uses to
+    describe the tool to the model.
+    """
+    tool = func.__name__
+
+    def _record(start: float, status: str) -> None:
+        REGISTRY.inc("agent_tool_calls_total", tool=tool, status=status)
+        REGISTRY.observe("agent_tool_latency_seconds", time.perf_counter() - start, tool=tool)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return await func(*args, **kwargs)
+            start = time.perf_counter()
+            status = "error"
+            with span(f"tool.{tool}"):
+                try:
+                    result = await func(*args, **kwargs)
+                    status = "ok"
+                    return result
+                finally:
+                    _record(start, status)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not REGISTRY.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        status = "error"
+        with span(f"tool.{tool}"):
+            try:
+                result = func(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                _record(start, status)
+    return wrapper
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_SERVER: Optional[ThreadingHTTPServer] = None
+_SERVER_LOCK = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve GET /metrics on a daemon thread (idempotent per process)."""
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            _SERVER = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_SERVER.serve_forever, name="metrics-server", daemon=True).start()
+    return _SERVER
+
+
+def configure_from_env() -> None:
+    """Apply AGENT_METRICS / AGENT_METRICS_OTEL / AGENT_METRICS_PORT (safe to call repeatedly)."""
+    REGISTRY.enabled = _truthy(os.getenv("AGENT_METRICS"))
+    REGISTRY.otel = _truthy(os.getenv("AGENT_METRICS_OTEL"))
+    port = os.getenv("AGENT_METRICS_PORT")
+    if REGISTRY.enabled and port:
+        try:
+            start_metrics_server(int(port))
+        except OSError:
+            # Another worker already owns the port; metrics are still recorded in-process
+            pass
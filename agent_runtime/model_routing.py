@@ -0,0 +1,202 @@
+"""
+Per-request model routing.
+Picks a model tier and output budget for each request from cheap local
+signals (query length, KB match score, conversation depth) under a policy
+declared in the agent's config.py, and records latency, tokens and estimated
+cost per route so the policy can be tuned.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Mapping, NamedTuple, Optional, Tuple
+
+from . import metrics
+from .history import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+metrics.REGISTRY.describe("agent_model_route_total", "Model requests by agent, route and model.")
+metrics.REGISTRY.describe("agent_model_route_latency_seconds", "Model request latency (through the last chunk) by route.")
+metrics.REGISTRY.describe("agent_model_route_tokens_total", "Prompt and output tokens by route.")
+metrics.REGISTRY.describe("agent_model_route_cost_usd_total", "Estimated model spend (USD) by route.")
+
+# ADK session state keys; the temp: prefix keeps them out of persisted state
+_STATE_ROUTE = "temp:model_route"
+_STATE_STARTED = "temp:model_route_started"
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """A model tier and its generation budget.
+
+    Args:
+        model: Model name sent with the request.
+        max_output_tokens: Output budget for requests on this route.
+        input_cost_per_1m: USD per million prompt tokens (for the cost estimate only).
+        output_cost_per_1m: USD per million output tokens.
+    """
+
+    model: str
+    max_output_tokens: int
+    input_cost_per_1m: float = 0.0
+    output_cost_per_1m: float = 0.0
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_cost_per_1m + output_tokens * self.output_cost_per_1m) / 1e6
+
+
+class RouteSignals(NamedTuple):
+    """Cheap per-request inputs to a routing decision."""
+    query: str
+    query_tokens: int
+    depth: int
+    kb_score: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    """Sends a request to `route` when every condition that is set holds.
+
+    Args:
+        route: Name of a route in the policy.
+        pattern: Regex the stripped query must match from its start (case-insensitive).
+        max_query_tokens: Longest query (estimated tokens) the rule accepts.
+        min_kb_score: Lowest best KB match score the rule accepts; unknown scores never match.
+        max_depth: Most earlier user turns in the conversation the rule accepts.
+    """
+
+    route: str
+    pattern: Optional[str] = None
+    max_query_tokens: Optional[int] = None
+    min_kb_score: Optional[float] = None
+    max_depth: Optional[int] = None
+
+    def matches(self, signals: RouteSignals) -> bool:
+        if self.max_query_tokens is not None and signals.query_tokens > self.max_query_tokens:
+            return False
+        if self.max_depth is not None and signals.depth > self.max_depth:
+            return False
+        if self.min_kb_score is not None and (signals.kb_score is None or signals.kb_score < self.min_kb_score):
+            return False
+        if self.pattern is not None and not re.match(self.pattern, signals.query.strip(), re.IGNORECASE):
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class RoutingPolicy:
+    """Named routes plus ordered rules; the first matching rule wins, else `default`."""
+
+    routes: Mapping[str, ModelRoute]
+    default: str
+    rules: Tuple[RouteRule, ...] = field(default_factory=tuple)
+
+    def __post_init__(self):
+        unknown = {self.default, *(rule.route for rule in self.rules)} - set(self.routes)
+        if unknown:
+            raise ValueError(f"Routing policy refers to undefined routes: {sorted(unknown)}")
+
+    @property
+    def uses_kb_score(self) -> bool:
+        return any(rule.min_kb_score is not None for rule in self.rules)
+
+    def choose(self, signals: RouteSignals) -> str:
+        for rule in self.rules:
+            if rule.matches(signals):
+                return rule.route
+        return self.default
+
+
+class RouteDecision(NamedTuple):
+    name: str
+    route: ModelRoute
+    signals: RouteSignals
+
+
+class ModelRouter:
+    """Applies a RoutingPolicy for one agent and records per-route metrics.
+
+    Use `before_model_callback` / `after_model_callback` as the ADK agent's
+    model callbacks, or call `route`, `config_for` and `record` directly
+    around a genai chat (the Streamlit app and load test do).
+
+    Args:
+        agent: Agent label for metrics.
+        policy: Routes and rules, usually from the agent's config.py.
+        kb_score: Async callable(query) -> best KB match score; only awaited
+            when a rule uses `min_kb_score`.
+        count_tokens: Token counter for query length; defaults to a local estimate.
+    """
+
+    def __init__(self, agent: str, policy: RoutingPolicy,
+                 kb_score: Optional[Callable[[str], Awaitable[Optional[float]]]] = None,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.agent = agent
+        self.policy = policy
+        self.kb_score = kb_score
+        self.count_tokens = count_tokens
+
+    async def signals(self, query: str, depth: int) -> RouteSignals:
+        kb_score = None
+        if self.kb_score is not None and self.policy.uses_kb_score and query.strip():
+            try:
+                kb_score = await self.kb_score(query)
+            except Exception:
+                logger.exception("KB score lookup failed; routing without it")
+        return RouteSignals(query, self.count_tokens(query), depth, kb_score)
+
+    async def route(self, query: str, depth: int) -> RouteDecision:
+        """Choose the route for `query`; `depth` is the number of earlier user turns."""
+        signals = await self.signals(query, depth)
+        name = self.policy.choose(signals)
+        route = self.policy.routes[name]
+        metrics.inc("agent_model_route_total", agent=self.agent, route=name, model=route.model)
+        return RouteDecision(name, route, signals)
+
+    @staticmethod
+    def config_for(decision: RouteDecision, base):
+        """A copy of the GenerateContentConfig `base` with the route's output budget."""
+        return base.model_copy(update={"max_output_tokens": decision.route.max_output_tokens})
+
+    def record(self, name: str, seconds: float, usage=None) -> None:
+        """Record one finished request on route `name`; `usage` is the response's usage_metadata."""
+        metrics.observe("agent_model_route_latency_seconds", seconds, agent=self.agent, route=name)
+        if usage is None:
+            return
+        input_tokens = usage.prompt_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        metrics.inc("agent_model_route_tokens_total", input_tokens, agent=self.agent, route=name, kind="input")
+        metrics.inc("agent_model_route_tokens_total", output_tokens, agent=self.agent, route=name, kind="output")
+        cost = self.policy.routes[name].cost(input_tokens, output_tokens)
+        metrics.inc("agent_model_route_cost_usd_total", cost, agent=self.agent, route=name)
+
+    async def before_model_callback(self, callback_context, llm_request) -> None:
+        """ADK before_model_callback: set the request's model and output budget."""
+        from google.genai import types
+
+        user_turns = [
+            "".join(part.text for part in content.parts if part.text)
+            for content in llm_request.contents
+            if content.role == "user" and content.parts and any(part.text for part in content.parts)
+        ]
+        query = user_turns[-1] if user_turns else ""
+        decision = await self.route(query, max(0, len(user_turns) - 1))
+        llm_request.model = decision.route.model
+        if llm_request.config is None:
+            llm_request.config = types.GenerateContentConfig()
+        llm_request.config.max_output_tokens = decision.route.max_output_tokens
+        callback_context.state[_STATE_ROUTE] = decision.name
+        callback_context.state[_STATE_STARTED] = time.monotonic()
+        return None
+
+    def after_model_callback(self, callback_context, llm_response) -> None:
+        """ADK after_model_callback: record latency and cost once the response is complete."""
+        if getattr(llm_response, "partial", False):
+            return None
+        name = callback_context.state.get(_STATE_ROUTE)
+        started = callback_context.state.get(_STATE_STARTED)
+        if name in self.policy.routes and started is not None:
+            self.record(name, time.monotonic() - started, llm_response.usage_metadata)
+        return None
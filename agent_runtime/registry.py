@@ -0,0 +1,84 @@
+"""
+Lazy agent registry.
+Agents are discovered by directory layout (a package containing agent.py)
+without importing them; a package and its SDK dependencies are imported only
+the first time that agent is selected.
+"""
+
+import importlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_HISTORY_TOKEN_BUDGET = 8000
+
+
+@dataclass(frozen=True)
+class LoadedAgent:
+    """An imported agent plus the optional hooks its agent.py exports.
+
+    Hooks (module-level names in <package>/agent.py):
+        root_agent: the ADK agent (required)
+        HISTORY_TOKEN_BUDGET: prompt budget for chat history
+        DIRECT_ROUTER: async callable(query) -> Optional[str] answering without the LLM
+        MODEL_ROUTER: agent_runtime.model_routing.ModelRouter choosing model and budget per request
+    """
+
+    name: str
+    package: str
+    agent: Any
+    history_token_budget: int
+    direct_router: Optional[Callable]
+    model_router: Optional[Any]
+    load_seconds: float
+
+
+class AgentRegistry:
+    """Maps display names to agent packages and imports each on first use."""
+
+    def __init__(self, packages: Dict[str, str]):
+        self._packages = dict(packages)
+        self._loaded: Dict[str, LoadedAgent] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def discover(cls, root: str, display_names: Optional[Dict[str, str]] = None) -> "AgentRegistry":
+        """Find agent packages under `root` (directories with __init__.py and agent.py)."""
+        display_names = display_names or {}
+        packages = {}
+        for entry in sorted(os.listdir(root)):
+            path = os.path.join(root, entry)
+            if entry.startswith((".", "_")) or not os.path.isdir(path):
+                continue
+            if os.path.isfile(os.path.join(path, "agent.py")) and os.path.isfile(os.path.join(path, "__init__.py")):
+                packages[display_names.get(entry, entry.replace("_", " ").title())] = entry
+        return cls(packages)
+
+    def names(self) -> List[str]:
+        return list(self._packages)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def load(self, name: str) -> LoadedAgent:
+        """Import the agent package for `name` (once) and return its agent and hooks."""
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            return loaded
+        with self._lock:
+            if name not in self._loaded:
+                package = self._packages[name]
+                start = time.perf_counter()
+                module = importlib.import_module(f"{package}.agent")
+                self._loaded[name] = LoadedAgent(
+                    name=name,
+                    package=package,
+                    agent=module.root_agent,
+                    history_token_budget=getattr(module, "HISTORY_TOKEN_BUDGET", DEFAULT_HISTORY_TOKEN_BUDGET),
+                    direct_router=getattr(module, "DIRECT_ROUTER", None),
+                    model_router=getattr(module, "MODEL_ROUTER", None),
+                    load_seconds=time.perf_counter() - start,
+                )
+        return self._loaded[name]
@@ -0,0 +1,280 @@
+"""
+Tail-latency controls for remote calls.
+Each call gets one deadline shared by all of its attempts, jittered
+exponential retries, and optionally a hedged duplicate request once an
+attempt has been outstanding longer than the recent p95 latency.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+from . import metrics
+
+T = TypeVar("T")
+
+metrics.REGISTRY.describe("agent_call_outcomes_total", "Resilient remote calls by outcome (ok, retry, hedge, deadline, error).")
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call did not succeed before its deadline."""
+
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile, or None until `min_samples` calls have been seen."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """Deadline, retry and hedging settings for a ResilientCall.
+
+    Args:
+        deadline: Seconds from the start of the call until it gives up, retries included.
+        max_attempts: Attempts in total (1 = no retries).
+        backoff: Base of the exponential backoff; each wait is uniform in [0, backoff * 2**n].
+        max_backoff: Upper bound on a single backoff wait.
+        hedge_quantile: Send one duplicate request once an attempt is slower than this
+            percentile of recent latencies; None disables hedging.
+        min_hedge_delay: Never hedge sooner than this, however fast recent calls were.
+    """
+
+    deadline: float = 2.0
+    max_attempts: int = 3
+    backoff: float = 0.05
+    max_backoff: float = 0.5
+    hedge_quantile: Optional[float] = 95.0
+    min_hedge_delay: float = 0.01
+
+
+def _always(error: BaseException) -> bool:
+    return True
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed remote call is worth retrying (or degrading around).
+
+    Only an explicit allowlist counts: deadlines and timeouts, connection and
+    transport errors, and GenAI API errors with status 429 or 5xx. Everything
+    else (4xx such as a bad API key, a missing key, programming errors) must
+    propagate.
+    """
+    import httpx
+    from google.genai import errors
+
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or error.code >= 500
+    return False
+
+
+class ResilientCall:
+    """Runs calls under a CallPolicy.
+
+    The wrapped function receives the seconds left until the deadline so it can
+    set its own transport timeout. Sync calls stop waiting at the deadline (the
+    attempt runs on a worker thread); async calls cancel outstanding attempts.
+
+    Args:
+        name: Label for the `agent_call_outcomes_total` metric.
+        policy: Deadline, retry and hedging settings.
+        retryable: Returns False for errors that must not be retried (e.g. HTTP 400).
+        max_workers: Worker threads for sync attempts and hedges.
+    """
+
+    def __init__(self, name: str, policy: CallPolicy = CallPolicy(),
+                 retryable: Callable[[BaseException], bool] = _always, max_workers: int = 32):
+        self.name = name
+        self.policy = policy
+        self.retryable = retryable
+        self.tracker = LatencyTracker()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _outcome(self, outcome: str) -> None:
+        metrics.inc("agent_call_outcomes_total", call=self.name, outcome=outcome)
+
+    def _hedge_at(self, start: float) -> Optional[float]:
+        if self.policy.hedge_quantile is None:
+            return None
+        latency = self.tracker.percentile(self.policy.hedge_quantile)
+        return None if latency is None else start + max(latency, self.policy.min_hedge_delay)
+
+    def _backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.policy.max_backoff, self.policy.backoff * 2 ** retry))
+
+    def _deadline_error(self) -> DeadlineExceeded:
+        return DeadlineExceeded(f"{self.name} exceeded its {self.policy.deadline}s deadline")
+
+    def _fail(self, error: Optional[BaseException], out_of_time: bool) -> BaseException:
+        if out_of_time or error is None:
+            self._outcome("deadline")
+            deadline_error = self._deadline_error()
+            deadline_error.__cause__ = error
+            return deadline_error
+        self._outcome("error")
+        return error
+
+    def call(self, fn: Callable[[float], T]) -> T:
+        """Call `fn(seconds_left)` with retries and hedging until it succeeds or the deadline passes."""
+        deadline_at = time.monotonic() + self.policy.deadline
+        error, out_of_time = None, False
+        for attempt in range(self.policy.max_attempts):
+            if attempt:
+                delay = self._backoff(attempt - 1)
+                if time.monotonic() + delay >= deadline_at:
+                    out_of_time = True
+                    break
+                self._outcome("retry")
+                time.sleep(delay)
+            try:
+                result = self._attempt(fn, deadline_at)
+            except DeadlineExceeded as e:
+                error, out_of_time = e, True
+                break
+            except Exception as e:
+                if not self.retryable(e):
+                    raise self._fail(e, False)
+                error = e
+                continue
+            self._outcome("ok")
+            return result
+        raise self._fail(error, out_of_time)
+
+    def _attempt(self, fn: Callable[[float], T], deadline_at: float) -> T:
+        def timed() -> T:
+            start = time.monotonic()
+            if start >= deadline_at:
+                raise self._deadline_error()
+            result = fn(deadline_at - start)
+            self.tracker.record(time.monotonic() - start)
+            return result
+
+        executor = self._get_executor()
+        pending = {executor.submit(timed)}
+        hedge_at = self._hedge_at(time.monotonic())
+        error: Optional[BaseException] = None
+        while pending:
+            now = time.monotonic()
+            if now >= deadline_at:
+                raise self._deadline_error()
+            until = deadline_at if hedge_at is None else min(hedge_at, deadline_at)
+            done, pending = wait(pending, timeout=until - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if pending and hedge_at is not None and time.monotonic() >= hedge_at:
+                hedge_at = None
+                self._outcome("hedge")
+                pending.add(executor.submit(timed))
+        raise error
+
+    async def acall(self, fn: Callable[[float], Awaitable[T]]) -> T:
+        """Async variant of `call`; `fn(seconds_left)` returns an awaitable."""
+        deadline_at = time.monotonic() + self.policy.deadline
+        error, out_of_time = None, False
+        for attempt in range(self.policy.max_attempts):
+            if attempt:
+                delay = self._backoff(attempt - 1)
+                if time.monotonic() + delay >= deadline_at:
+                    out_of_time = True
+                    break
+                self._outcome("retry")
+                await asyncio.sleep(delay)
+            try:
+                result = await self._aattempt(fn, deadline_at)
+            except DeadlineExceeded as e:
+                error, out_of_time = e, True
+                break
+            except Exception as e:
+                if not self.retryable(e):
+                    raise self._fail(e, False)
+                error = e
+                continue
+            self._outcome("ok")
+            return result
+        raise self._fail(error, out_of_time)
+
+    async def _aattempt(self, fn: Callable[[float], Awaitable[T]], deadline_at: float) -> T:
+        async def timed() -> T:
+            start = time.monotonic()
+            result = await fn(deadline_at - start)
+            self.tracker.record(time.monotonic() - start)
+            return result
+
+        pending = {asyncio.ensure_future(timed())}
+        hedge_at = self._hedge_at(time.monotonic())
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline_at:
+                    raise self._deadline_error()
+                until = deadline_at if hedge_at is None else min(hedge_at, deadline_at)
+                done, pending = await asyncio.wait(pending, timeout=until - now, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if pending and hedge_at is not None and time.monotonic() >= hedge_at:
+                    hedge_at = None
+                    self._outcome("hedge")
+                    pending.add(asyncio.ensure_future(timed()))
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def pooled_http_options(timeout: Optional[float] = None, max_connections: int = 32,
+                        max_keepalive: int = 16, keepalive_expiry: float = 30.0):
+    """`types.HttpOptions` for a genai.Client with tuned, pooled httpx transports.
+
+    Keep-alive connections are reused across calls (no TLS handshake per
+    request) and both the sync and async clients use httpx with the same
+    limits. `timeout` (seconds) is the default per-request timeout.
+
+    The async transport's connections belong to the event loop that opens
+    them, so build a separate client from fresh options for each loop.
+    """
+    import httpx
+    from google.genai import types
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                          keepalive_expiry=keepalive_expiry)
+    return types.HttpOptions(
+        timeout=None if timeout is None else int(timeout * 1000),
+        client_args={"transport": httpx.HTTPTransport(limits=limits)},
+        async_client_args={"transport": httpx.AsyncHTTPTransport(limits=limits)},
+    )
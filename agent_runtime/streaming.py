@@ -0,0 +1,74 @@
+"""
+Coalesced rendering for streamed model responses.
+Re-rendering the whole response on every chunk is O(n^2) in response length;
+these helpers batch chunks and only push updates when something changed.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+
+class RenderCoalescer:
+    """Buffers streamed text and renders it at most every `interval` seconds
+    or once `max_pending_chars` new characters have accumulated.
+
+    Args:
+        render: Called with the full text so far (e.g. `placeholder.markdown`).
+        interval: Minimum seconds between renders.
+        max_pending_chars: Render early once this many characters are buffered.
+    """
+
+    def __init__(self, render: Callable[[str], None], interval: float = 0.1,
+                 max_pending_chars: int = 1000, clock: Callable[[], float] = time.monotonic):
+        self._render = render
+        self.interval = interval
+        self.max_pending_chars = max_pending_chars
+        self._clock = clock
+        self._flushed: List[str] = []
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._last_render = float("-inf")  # first chunk renders immediately
+        self.renders = 0
+
+    @property
+    def text(self) -> str:
+        """Full text received so far, including chunks not yet rendered."""
+        return "".join(self._flushed) + "".join(self._pending)
+
+    def append(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+        if (self._pending_chars >= self.max_pending_chars
+                or self._clock() - self._last_render >= self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Render everything received so far if there is anything new."""
+        if not self._pending:
+            return
+        # Collapse the flushed chunks into one string so later joins stay cheap
+        self._flushed = ["".join(self._flushed + self._pending)]
+        self._pending = []
+        self._pending_chars = 0
+        self._last_render = self._clock()
+        self.renders += 1
+        self._render(self._flushed[0])
+
+
+class StatusChannel:
+    """Forwards status label/state changes and tool activity, skipping no-op updates."""
+
+    def __init__(self, update: Callable[..., None], write: Callable[[str], None]):
+        self._update = update
+        self._write = write
+        self._state: Optional[tuple] = None
+
+    def set(self, label: str, state: str = "running") -> None:
+        if self._state != (label, state):
+            self._state = (label, state)
+            self._update(label=label, state=state)
+
+    def tool_used(self, name: str) -> None:
+        self._write(f"🛠️ Tool Used: `{name}`")
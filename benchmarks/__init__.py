@@ -0,0 +1 @@
+"""Offline benchmarks for the agents (no API key required)."""
@@ -0,0 +1,74 @@
+"""
+Deterministic, local stand-in for the Gemini embedding API.
+Vectors are sums of per-token pseudo-random vectors, so texts sharing words
+are similar, results are reproducible, and no network or API key is needed.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class FakeEmbeddingBackend:
+    """Hash-seeded bag-of-words embeddings with configurable per-call latency.
+
+    Args:
+        dim: Embedding dimension.
+        latency: Seconds slept per embed call (single or batch), simulating a round-trip.
+    """
+
+    def __init__(self, dim: int = 256, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+        self.calls = 0
+        self._token_vectors: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._token_vectors.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            self._token_vectors[token] = vector
+        return vector
+
+    def embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in _TOKEN.findall(text.lower()):
+            vector += self._token_vector(token)
+        return vector.tolist()
+
+    def embed_content(self, model: str, contents: Union[str, Sequence[str]], **_):
+        """Mimics `client.models.embed_content` (single text or list of texts)."""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        texts = [contents] if isinstance(contents, str) else list(contents)
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=self.embed(t)) for t in texts])
+
+    async def aembed_content(self, model: str, contents: Union[str, Sequence[str]], **_):
+        """Mimics `client.aio.models.embed_content`."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        texts = [contents] if isinstance(contents, str) else list(contents)
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=self.embed(t)) for t in texts])
+
+    def client(self) -> SimpleNamespace:
+        """A minimal object shaped like `genai.Client` for the embedding endpoints."""
+        return SimpleNamespace(
+            models=SimpleNamespace(embed_content=self.embed_content),
+            aio=SimpleNamespace(models=SimpleNamespace(embed_content=self.aembed_content)),
+        )
+
+
+def install(tools_module, backend: FakeEmbeddingBackend) -> None:
+    """Route every embedding call in `tools_module` through `backend`."""
+    fake_client = backend.client()
+    tools_module._get_client = lambda: fake_client
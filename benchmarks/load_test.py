@@ -0,0 +1,241 @@
+"""
+Concurrent load test for the agents against a local mock Gemini API.
+
+Simulates N chat sessions in parallel, each sending several turns to one of
+the agents, and reports time to first token, total latency percentiles and
+throughput per agent and per model route. By default sessions take the
+Streamlit app's path (agent_runtime.ChatSession: direct router, per-request
+model routing, token-budgeted history, an async chat with automatic function
+calling); --mode runner drives the ADK agents through an InMemoryRunner instead.
+
+Usage:
+    python -m benchmarks.load_test --sessions 50 --turns 4
+    python -m benchmarks.load_test --agents thoughtful_ai_agent --ttft 0.8 --json load.json
+    python -m benchmarks.load_test --mode runner --sessions 20
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8089   # external mock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agent_runtime import ChatSession, HistoryManager
+
+from .mock_gemini import MockConfig, MockGeminiServer
+
+PROMPTS = {
+    "greeting_agent": [
+        "Hi there!",
+        "What time is it?",
+        "Tell me about the company.",
+        "How does the class progression work?",
+        "Thanks, bye!",
+    ],
+    "thoughtful_ai_agent": [
+        "What does the eligibility verification agent (EVA) do?",
+        "What does the claims processing agent (CAM) do?",
+        "How does the payment posting agent (PHIL) work?",
+        "Tell me about Thoughtful AI's Agents.",
+        "What are the benefits of using Thoughtful AI's agents?",
+        "Can your agents integrate with our EHR system?",
+        "What's the weather like today?",
+    ],
+}
+
+
+def _sample(loaded) -> Dict:
+    return {"agent": loaded.package, "route": "llm", "model_route": None,
+            "ttft": None, "total": None, "error": None}
+
+
+async def run_session(client, loaded, prompts: List[str], turns: int, rng: random.Random,
+                      model_routing: bool = True) -> List[Dict]:
+    """One user conversation through a ChatSession (the Streamlit app's path); returns a sample per turn."""
+    session = ChatSession(client, loaded, HistoryManager(loaded.history_token_budget), model_routing=model_routing)
+    messages: List[Dict[str, str]] = []
+    samples = []
+    for _ in range(turns):
+        message = rng.choice(prompts)
+        sample = _sample(loaded)
+        start = time.perf_counter()
+        text = []
+        try:
+            async for event in session.reply(message, messages):
+                if sample["ttft"] is None and event.text:
+                    sample["ttft"] = time.perf_counter() - start
+                text.append(event.text)
+        except Exception as e:
+            sample["error"] = f"{type(e).__name__}: {e}"
+        sample["total"] = time.perf_counter() - start
+        sample["route"] = "kb" if session.direct else "llm"
+        sample["model_route"] = session.decision.name if session.decision is not None else None
+        messages += [{"role": "user", "content": message}, {"role": "assistant", "content": "".join(text)}]
+        samples.append(sample)
+    return samples
+
+
+async def run_runner_session(runner, loaded, prompts: List[str], turns: int, rng: random.Random,
+                             user_id: str) -> List[Dict]:
+    """One user conversation through an ADK Runner, so the agent's own callbacks, tools and
+    session state run as in `adk web`; returns a sample per turn.
+
+    A turn that produced no model usage was answered by the agent's before_agent_callback
+    (route "kb"). Model routes are chosen inside the agent and are not reported per sample.
+    """
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.genai import types
+
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id=user_id)
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    samples = []
+    for _ in range(turns):
+        message = types.Content(role="user", parts=[types.Part(text=rng.choice(prompts))])
+        sample = _sample(loaded)
+        start = time.perf_counter()
+        used_model = False
+        try:
+            async for event in runner.run_async(user_id=user_id, session_id=session.id,
+                                                new_message=message, run_config=run_config):
+                used_model = used_model or event.usage_metadata is not None
+                has_text = event.content is not None and any(part.text for part in event.content.parts or ())
+                if sample["ttft"] is None and has_text:
+                    sample["ttft"] = time.perf_counter() - start
+        except Exception as e:
+            sample["error"] = f"{type(e).__name__}: {e}"
+        sample["total"] = time.perf_counter() - start
+        sample["route"] = "llm" if used_model else "kb"
+        samples.append(sample)
+    return samples
+
+
+def _percentiles(values: List[float], prefix: str) -> Dict[str, Optional[float]]:
+    if not values:
+        return {f"{prefix}_p{q}_ms": None for q in (50, 95, 99)}
+    return {f"{prefix}_p{q}_ms": round(float(np.percentile(values, q)) * 1000, 1) for q in (50, 95, 99)}
+
+
+def summarize(samples: List[Dict], elapsed: float) -> Dict:
+    ok = [s for s in samples if s["error"] is None]
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "kb_routed": sum(s["route"] == "kb" for s in ok),
+        **_percentiles([s["ttft"] for s in ok if s["ttft"] is not None], "ttft"),
+        **_percentiles([s["total"] for s in ok], "total"),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+    }
+
+
+async def run_load(client, agents: List, sessions: int, turns: int, seed: int, model_routing: bool = True,
+                   mode: str = "chat") -> Dict:
+    rng = random.Random(seed)
+    runners = {}
+    if mode == "runner":
+        from google.adk.runners import InMemoryRunner
+
+        runners = {loaded.package: InMemoryRunner(agent=loaded.agent, app_name=loaded.package) for loaded in agents}
+    jobs = []
+    for i in range(sessions):
+        loaded = agents[i % len(agents)]
+        prompts = PROMPTS.get(loaded.package, ["Hello!"])
+        session_rng = random.Random(rng.random())
+        if mode == "runner":
+            jobs.append(run_runner_session(runners[loaded.package], loaded, prompts, turns, session_rng,
+                                           user_id=f"load-{i}"))
+        else:
+            jobs.append(run_session(client, loaded, prompts, turns, session_rng, model_routing))
+    start = time.perf_counter()
+    results = await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for session in results for sample in session]
+    report = {"elapsed_s": round(elapsed, 3), "overall": summarize(samples, elapsed), "agents": {}}
+    for loaded in agents:
+        mine = [s for s in samples if s["agent"] == loaded.package]
+        report["agents"][loaded.package] = summarize(mine, elapsed)
+    routes = sorted({s["model_route"] for s in samples if s["model_route"]})
+    if routes:
+        report["model_routes"] = {name: summarize([s for s in samples if s["model_route"] == name], elapsed)
+                                  for name in routes}
+    errors = sorted({s["error"] for s in samples if s["error"]})
+    if errors:
+        report["error_examples"] = errors[:5]
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=3, help="messages per session")
+    parser.add_argument("--agents", nargs="+", default=["greeting_agent", "thoughtful_ai_agent"])
+    parser.add_argument("--base-url", help="use an already running mock (or other endpoint) at this URL")
+    parser.add_argument("--ttft", type=float, default=0.3, help="mock median time to first token (s)")
+    parser.add_argument("--ttft-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--tool-call-rate", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.02)
+    parser.add_argument("--mode", choices=["chat", "runner"], default="chat",
+                        help="chat: the Streamlit app's ChatSession path; runner: an ADK InMemoryRunner per agent")
+    parser.add_argument("--no-model-routing", action="store_true",
+                        help="send every request to the agent's default model and budget (chat mode)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        config = MockConfig(ttft_median=args.ttft, ttft_sigma=args.ttft_sigma,
+                            tokens_per_second=args.tokens_per_second,
+                            tool_call_rate=args.tool_call_rate,
+                            embed_latency=args.embed_latency, seed=args.seed)
+        server = MockGeminiServer(config).start()
+        base_url = server.url
+
+    # Every genai.Client in the process (including the KB's embedding client)
+    # talks to the mock; mock vectors go to a throwaway embedding store.
+    os.environ["GOOGLE_GEMINI_BASE_URL"] = base_url
+    os.environ["GOOGLE_API_KEY"] = os.environ.get("GOOGLE_API_KEY") or "mock"
+    os.environ.pop("GOOGLE_GENAI_USE_VERTEXAI", None)
+    store = tempfile.TemporaryDirectory()
+    os.environ["THOUGHTFUL_EMBEDDING_STORE"] = store.name
+
+    from google import genai
+    from agent_runtime.registry import AgentRegistry
+
+    registry = AgentRegistry({package: package for package in args.agents})
+    try:
+        agents = [registry.load(package) for package in args.agents]
+        client = genai.Client()
+        report = asyncio.run(run_load(client, agents, args.sessions, args.turns, args.seed,
+                                      model_routing=not args.no_model_routing, mode=args.mode))
+    finally:
+        if server is not None:
+            server.stop()
+        store.cleanup()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "mock_requests": dict(server.requests) if server is not None else None,
+        **report,
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Local HTTP stand-in for the Gemini API (generateContent, streamGenerateContent,
+embedContent, batchEmbedContents) with configurable latency, token rate and
+tool-call behaviour. Point a client at it with
+`genai.Client(api_key="mock", http_options=types.HttpOptions(base_url=server.url))`
+or GOOGLE_GEMINI_BASE_URL.
+
+Usage:
+    python -m benchmarks.mock_gemini --port 8089 --ttft 0.3 --tokens-per-second 80
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from .fake_embeddings import FakeEmbeddingBackend
+
+WORDS = ("our agents automate eligibility claims and payment posting so your team can focus on "
+         "patients while we handle the repetitive administrative work reliably").split()
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server.
+
+    Time to first token is log-normal around `ttft_median` (`ttft_sigma` is the
+    log-space spread); tokens then arrive at `tokens_per_second` in chunks.
+    Responses stop at the request's maxOutputTokens. `model_latency` scales
+    TTFT and per-token time for models whose name contains the key.
+    """
+
+    ttft_median: float = 0.3
+    ttft_sigma: float = 0.5
+    tokens_per_second: float = 80.0
+    min_tokens: int = 40
+    max_tokens: int = 200
+    chunk_tokens: int = 5
+    tool_call_rate: float = 0.5
+    embed_latency: float = 0.02
+    embed_dim: int = 256
+    seed: Optional[int] = None
+    model_latency: Dict[str, float] = field(default_factory=lambda: {"lite": 0.6})
+
+
+def _last_user_text(contents: List[Dict]) -> str:
+    for content in reversed(contents):
+        if content.get("role", "user") == "user":
+            texts = [part["text"] for part in content.get("parts", []) if "text" in part]
+            if texts:
+                return " ".join(texts)
+    return ""
+
+
+def _has_function_response(contents: List[Dict]) -> bool:
+    return bool(contents) and any("functionResponse" in part for part in contents[-1].get("parts", []))
+
+
+def _function_call(body: Dict, rng: random.Random, rate: float) -> Optional[Dict]:
+    """Pick a declared function to call, filling string parameters with the user's text."""
+    declarations = [d for tool in body.get("tools", []) for d in tool.get("functionDeclarations", [])]
+    contents = body.get("contents", [])
+    if not declarations or _has_function_response(contents) or rng.random() >= rate:
+        return None
+    declaration = rng.choice(declarations)
+    properties = (declaration.get("parameters") or {}).get("properties") or {}
+    text = _last_user_text(contents)
+    args = {name: text for name, schema in properties.items() if str(schema.get("type", "")).upper() == "STRING"}
+    return {"functionCall": {"name": declaration["name"], "args": args}}
+
+
+def _response(parts: List[Dict], finish: Optional[str], prompt_tokens: int, output_tokens: int) -> Dict:
+    candidate = {"content": {"role": "model", "parts": parts}, "index": 0}
+    if finish:
+        candidate["finishReason"] = finish
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+    }
+
+
+class MockGeminiServer:
+    """Threaded HTTP server implementing the Gemini endpoints used by the agents."""
+
+    def __init__(self, config: MockConfig = MockConfig(), host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+        self.embeddings = FakeEmbeddingBackend(dim=config.embed_dim)
+        self.requests: Dict[str, int] = {}
+        self._requests_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGeminiServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockGeminiServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def latency_scale(self, model: str) -> float:
+        return next((scale for key, scale in self.config.model_latency.items() if key in model), 1.0)
+
+    def _sample(self, body: Dict) -> Tuple[float, int, Optional[Dict]]:
+        config = self.config
+        with self._rng_lock:
+            ttft = self._rng.lognormvariate(0, config.ttft_sigma) * config.ttft_median
+            n_tokens = self._rng.randint(config.min_tokens, config.max_tokens)
+            call = _function_call(body, self._rng, config.tool_call_rate)
+        max_output = (body.get("generationConfig") or {}).get("maxOutputTokens")
+        if max_output:
+            n_tokens = max(1, min(n_tokens, int(max_output)))
+        return ttft, n_tokens, call
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, payload: Dict, status: int = 200) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                resource, _, method = self.path.split("?")[0].rpartition(":")
+                with server._requests_lock:
+                    server.requests[method] = server.requests.get(method, 0) + 1
+                model = resource.rsplit("/", 1)[-1]
+                if method == "generateContent":
+                    self._generate(body, model, stream=False)
+                elif method == "streamGenerateContent":
+                    self._generate(body, model, stream=True)
+                elif method in ("embedContent", "batchEmbedContents"):
+                    self._embed(body, batch=method == "batchEmbedContents")
+                else:
+                    self._json({"error": {"code": 404, "message": f"Unknown method {method}"}}, 404)
+
+            def _embed(self, body: Dict, batch: bool) -> None:
+                time.sleep(server.config.embed_latency)
+                requests = body.get("requests", []) if batch else [body]
+                embeddings = []
+                for request in requests:
+                    text = " ".join(p.get("text", "") for p in request.get("content", {}).get("parts", []))
+                    embeddings.append({"values": server.embeddings.embed(text)})
+                self._json({"embeddings": embeddings} if batch else {"embedding": embeddings[0]})
+
+            def _generate(self, body: Dict, model: str, stream: bool) -> None:
+                config = server.config
+                scale = server.latency_scale(model)
+                ttft, n_tokens, call = server._sample(body)
+                prompt_tokens = len(json.dumps(body.get("contents", []))) // 4
+                time.sleep(ttft * scale)
+                if call is not None:
+                    payload = _response([call], "STOP", prompt_tokens, 1)
+                    if stream:
+                        self._sse([payload])
+                    else:
+                        self._json(payload)
+                    return
+
+                words = [WORDS[i % len(WORDS)] for i in range(n_tokens)]
+                if not stream:
+                    time.sleep(n_tokens / config.tokens_per_second * scale)
+                    self._json(_response([{"text": " ".join(words)}], "STOP", prompt_tokens, n_tokens))
+                    return
+                chunks = []
+                for start in range(0, n_tokens, config.chunk_tokens):
+                    text = " ".join(words[start:start + config.chunk_tokens]) + " "
+                    last = start + config.chunk_tokens >= n_tokens
+                    chunks.append(_response([{"text": text}], "STOP" if last else None,
+                                            prompt_tokens, min(start + config.chunk_tokens, n_tokens)))
+                self._sse(chunks, delay=config.chunk_tokens / config.tokens_per_second * scale)
+
+            def _sse(self, payloads: List[Dict], delay: float = 0.0) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, payload in enumerate(payloads):
+                    if i and delay:
+                        time.sleep(delay)
+                    data = f"data: {json.dumps(payload)}\r\n\r\n".encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local mock of the Gemini API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--ttft", type=float, default=0.3, help="median time to first token (s)")
+    parser.add_argument("--ttft-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--tool-call-rate", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.02)
+    args = parser.parse_args(argv)
+    config = MockConfig(ttft_median=args.ttft, ttft_sigma=args.ttft_sigma,
+                        tokens_per_second=args.tokens_per_second,
+                        tool_call_rate=args.tool_call_rate, embed_latency=args.embed_latency)
+    server = MockGeminiServer(config, args.host, args.port)
+    print(f"Mock Gemini API listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+"""
+Offline benchmark for the Thoughtful AI retrieval path.
+
+Runs search_knowledge_base_sync against synthetic knowledge bases with a local,
+deterministic embedding backend and reports cold-init time, query latency
+percentiles, throughput and peak memory. Also checks that every bundled FAQ
+question, asked verbatim, takes the lexical shortcut (no embedding call).
+
+Usage:
+    python -m benchmarks.retrieval --sizes 10 1000 100000 --json bench.json
+    python -m benchmarks.retrieval --sizes 1000 --compare bench.json
+    python -m benchmarks.retrieval --sizes 100000 --precision int8
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+from thoughtful_ai_agent import tools
+from thoughtful_ai_agent.index import QuantizedIndex, quantization_recall
+from thoughtful_ai_agent.knowledge_base import KnowledgeBase
+from thoughtful_ai_agent.lexical import BM25Index
+from .fake_embeddings import FakeEmbeddingBackend, install
+
+VOCABULARY = [f"term{i}" for i in range(5000)]
+PRODUCTS = ["eva", "cam", "phil", "claims", "eligibility", "payments", "billing", "coding"]
+TEMPLATES = ["What is {}?", "How does {} work?", "Tell me about {}", "Can {} help with {}?"]
+
+
+def synthetic_pairs(n: int, seed: int = 0):
+    """Yield `n` (question, answer) pairs; roughly three phrasings share each answer."""
+    rng = random.Random(seed)
+    for i in range(n):
+        topic = " ".join([rng.choice(PRODUCTS)] + rng.sample(VOCABULARY, 3))
+        template = TEMPLATES[i % len(TEMPLATES)]
+        question = template.format(topic, rng.choice(VOCABULARY))
+        yield question, f"Answer {i // 3}: {topic} automates {rng.choice(VOCABULARY)}."
+
+
+def write_jsonl(path: str, n: int, seed: int = 0) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for question, answer in synthetic_pairs(n, seed):
+            f.write(json.dumps({"question": question, "answer": answer}) + "\n")
+
+
+def make_queries(questions: List[str], count: int, seed: int = 1) -> List[str]:
+    """Mix of exact stored questions, perturbed paraphrases and unrelated queries."""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        question = rng.choice(questions)
+        if i % 3 == 0:
+            queries.append(question)
+        elif i % 3 == 1:
+            words = question.split()
+            words.pop(rng.randrange(len(words)))
+            queries.append(" ".join(words + [f"extra{rng.randrange(10**6)}"]))
+        else:
+            queries.append(" ".join(f"unknown{rng.randrange(10**6)}" for _ in range(4)))
+    return queries
+
+
+def reset_tools() -> None:
+    tools._SNAPSHOT = tools._WATCHER = None
+    tools._QUERY_CACHE.clear()
+
+
+def percentile_ms(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000) if samples else 0.0
+
+
+def traced_peak(store_dir: str, queries: List[str]) -> int:
+    """Peak traced bytes of a cold init into `store_dir` plus one pass over `queries`.
+
+    Runs after (never during) the timed passes, since tracing slows every allocation.
+    """
+    tools.EMBEDDING_STORE_DIR = store_dir
+    reset_tools()
+    tracemalloc.start()
+    try:
+        tools._initialize_knowledge_base()
+        for query in queries:
+            tools.search_knowledge_base_sync(query)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_size(n: int, n_queries: int, backend: FakeEmbeddingBackend, index: str,
+               precision: str = "float32") -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        kb_path = os.path.join(tmp, "kb.jsonl")
+        write_jsonl(kb_path, n)
+        tools.KB_PATH = kb_path
+        tools.EMBEDDING_STORE_DIR = os.path.join(tmp, "store")
+        tools.KB_INDEX_BACKEND = index
+        tools.KB_PRECISION = precision
+        reset_tools()
+
+        start = time.perf_counter()
+        tools._initialize_knowledge_base()
+        cold_init = time.perf_counter() - start
+
+        # Warm start: same store, fresh process state
+        reset_tools()
+        start = time.perf_counter()
+        tools._initialize_knowledge_base()
+        warm_init = time.perf_counter() - start
+
+        queries = make_queries(tools._SNAPSHOT.kb.questions, n_queries)
+        calls_before = backend.calls
+        latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            t0 = time.perf_counter()
+            tools.search_knowledge_base_sync(query)
+            latencies.append(time.perf_counter() - t0)
+        total = time.perf_counter() - start
+        query_embed_calls = backend.calls - calls_before
+
+        kb_index = tools._SNAPSHOT.index
+        index_bytes = kb_index.matrix.nbytes
+        recall = None
+        if isinstance(kb_index, QuantizedIndex):
+            index_bytes += kb_index.scales.nbytes if kb_index.scales is not None else 0
+            recall = quantization_recall(kb_index, [backend.embed(q) for q in queries[:50]], k=10)
+
+        peak = traced_peak(os.path.join(tmp, "traced_store"), queries)
+
+    return {
+        "kb_size": n,
+        "index": index,
+        "precision": precision,
+        "queries": n_queries,
+        "cold_init_s": round(cold_init, 4),
+        "warm_init_s": round(warm_init, 4),
+        "p50_ms": round(percentile_ms(latencies, 50), 4),
+        "p95_ms": round(percentile_ms(latencies, 95), 4),
+        "p99_ms": round(percentile_ms(latencies, 99), 4),
+        "throughput_qps": round(n_queries / total, 1) if total else None,
+        "query_embed_calls": query_embed_calls,
+        "index_mb": round(index_bytes / 2**20, 2),
+        "recall_at_10": round(recall["rescored"], 4) if recall else None,
+        "recall_at_10_scan_only": round(recall["scan_only"], 4) if recall else None,
+        "peak_traced_mb": round(peak / 2**20, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def check_lexical_shortcut() -> List[str]:
+    """Return the bundled FAQ questions that do not take the lexical shortcut when asked verbatim."""
+    kb = KnowledgeBase.from_records(tools.QA_DATASET)
+    lexical = BM25Index(kb.questions)
+    return [q for q in kb.questions if tools._lexical_shortcut(kb, lexical.scores(q)) is None]
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Return human-readable regressions versus a previous JSON report."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["kb_size"], r["index"], r.get("precision", "float32")): r
+                    for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get((result["kb_size"], result["index"], result["precision"]))
+        if not before:
+            continue
+        for metric in ("cold_init_s", "warm_init_s", "p50_ms", "p95_ms", "p99_ms", "peak_traced_mb"):
+            if before[metric] and result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['index']}@{result['kb_size']}: {metric} {before[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100_000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=256, help="fake embedding dimension")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per embed call")
+    parser.add_argument("--index", choices=["exact", "ivf"], default="exact")
+    parser.add_argument("--precision", choices=["float32", "float16", "int8"], default="float32",
+                        help="KB matrix storage (quantized runs also report recall vs exact)")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="previous JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    missed = check_lexical_shortcut()
+    for question in missed:
+        print(f"LEXICAL SHORTCUT MISSED {question!r}", file=sys.stderr)
+
+    backend = FakeEmbeddingBackend(dim=args.dim, latency=args.latency)
+    install(tools, backend)
+
+    results = []
+    for n in args.sizes:
+        result = bench_size(n, args.queries, backend, args.index, args.precision)
+        results.append(result)
+        print(json.dumps(result))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "params": vars(args),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = compare(results, args.compare, args.tolerance) if args.compare else []
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions or missed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
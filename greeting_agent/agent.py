@@ -4,9 +4,18 @@ Demonstrates basic ADK agent structure with custom Python function tools
 """
 
 from google.adk import Agent
+from agent_runtime.metrics import configure_from_env
+from agent_runtime.model_routing import ModelRouter
 from .config import GREETING_AGENT_CONFIG, GREETING_AGENT_DESCRIPTION, GREETING_AGENT_INSTRUCTION, GREETING_AGENT_MODEL
+from .config import GREETING_AGENT_HISTORY_TOKEN_BUDGET, GREETING_AGENT_MODEL_ROUTING
 from .tools import get_company_info, get_current_time, get_class_roadmap
 
+# Enable tool metrics / the /metrics endpoint when AGENT_METRICS is set
+configure_from_env()
+
+# Picks the model tier and output budget per request (see GREETING_AGENT_MODEL_ROUTING)
+MODEL_ROUTER = ModelRouter("greeting_agent", GREETING_AGENT_MODEL_ROUTING)
+
 root_agent = Agent(
     name="greeting_agent",
     model=GREETING_AGENT_MODEL,
@@ -14,4 +23,9 @@ root_agent = Agent(
     description=GREETING_AGENT_DESCRIPTION,
     instruction=GREETING_AGENT_INSTRUCTION,
     tools=[get_company_info, get_current_time, get_class_roadmap],
-)
\ No newline at end of file
+    before_model_callback=MODEL_ROUTER.before_model_callback,
+    after_model_callback=MODEL_ROUTER.after_model_callback,
+)
+
+# Hooks read by agent_runtime.registry
+HISTORY_TOKEN_BUDGET = GREETING_AGENT_HISTORY_TOKEN_BUDGET
@@ -7,6 +7,8 @@ from google.genai import types
 from google.genai.types import GenerateContentConfig
 from google.genai.types import SafetySetting
 
+from agent_runtime.model_routing import ModelRoute, RouteRule, RoutingPolicy
+
 class GreetingAgentConfig(GenerateContentConfig):
     max_output_tokens: int = 5000
     temperature: float = 0.7
@@ -21,6 +23,25 @@ GREETING_AGENT_MODEL: str = "gemini-2.0-flash-exp"
 
 GREETING_AGENT_CONFIG = GreetingAgentConfig()
 
+# Per-request model routing: greetings and small talk get the fastest, cheapest tier with a small
+# output budget; everything else keeps the default model and budget. Costs are USD per 1M tokens
+# (list prices) and only feed the estimated-cost metric.
+GREETING_PATTERN: str = r"(hi|hello|hey|howdy|thanks|thank you|bye|goodbye|good (morning|afternoon|evening))\b"
+
+GREETING_AGENT_MODEL_ROUTING = RoutingPolicy(
+    routes={
+        "fast": ModelRoute("gemini-2.0-flash-lite", max_output_tokens=256,
+                           input_cost_per_1m=0.075, output_cost_per_1m=0.30),
+        "standard": ModelRoute(GREETING_AGENT_MODEL, max_output_tokens=GREETING_AGENT_CONFIG.max_output_tokens,
+                               input_cost_per_1m=0.10, output_cost_per_1m=0.40),
+    },
+    rules=(RouteRule("fast", pattern=GREETING_PATTERN, max_query_tokens=8),),
+    default="standard",
+)
+
+# Prompt budget for chat history; older turns are summarized once it is exceeded
+GREETING_AGENT_HISTORY_TOKEN_BUDGET: int = 8000
+
 GREETING_AGENT_DESCRIPTION: str = (
     "A friendly class assistant that helps developers learn ADK agent building"
 )
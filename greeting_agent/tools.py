@@ -2,48 +2,46 @@
 Custom tools for greeting_agent
 Demonstrates how to create simple Python functions as agent tools
 """
-from datetime import datetime
+import os
+from datetime import datetime, timedelta, timezone
 
+from agent_runtime.data_files import DataFile
+from agent_runtime.metrics import instrument_tool
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Payloads live in data files: loaded once, frozen, and reloaded only when the file changes
+COMPANY_INFO = DataFile(os.path.join(DATA_DIR, "company_info.yaml"))
+CLASS_PROGRESSION = DataFile(os.path.join(DATA_DIR, "class_progression.yaml"))
+
+# Eastern Time is UTC-5 (EST) or UTC-4 (EDT)
+# Using EST for consistency with class location
+EASTERN = timezone(timedelta(hours=-5), "EST")
+
+
+@instrument_tool
 def get_company_info() -> dict:
     """Get information about the user's company and current AI initiative.
 
     This tool provides details about the organization and ongoing AI agent projects.
 
     INSTRUCTOR NOTE: Students will customize this with their own company/project
-    information as their first hands-on exercise in the class.
+    information (data/company_info.yaml) as their first hands-on exercise in the class.
 
     Returns:
         dict: Company information including name, industry, and current AI initiatives
     """
-    return {
-        "company_name": "Acme Corporation",
-        "industry": "Technology & Innovation",
-        "location": "San Francisco, CA",
-        "current_initiative": "Enterprise AI Agent Platform",
-        "use_cases": [
-            "Customer service automation",
-            "Financial analysis & reporting",
-            "Content creation pipelines",
-            "Software development assistance"
-        ],
-        "team_size": "12 engineers, 3 product managers",
-        "goal": "Deploy production-ready AI agents for enterprise workflows"
-    }
+    return COMPANY_INFO.get()
 
 
+@instrument_tool
 def get_current_time() -> dict:
     """Get the current time in Atlanta timezone.
 
     Returns:
         dict: Current time information including time, timezone, and formatted string
     """
-    from datetime import timezone, timedelta
-
-    # Eastern Time is UTC-5 (EST) or UTC-4 (EDT)
-    # Using EST for consistency with class location
-    eastern = timezone(timedelta(hours=-5))
-    now = datetime.now(eastern)
+    now = datetime.now(EASTERN)
 
     return {
         "current_time": now.strftime("%I:%M %p"),
@@ -53,6 +51,7 @@ def get_current_time() -> dict:
     }
 
 
+@instrument_tool
 def get_class_roadmap() -> dict:
     """Get the complete 9-agent class progression.
 
@@ -61,33 +60,4 @@ def get_class_roadmap() -> dict:
     Returns:
         dict: class roadmap with all 9 agents and their patterns
     """
-    return {
-        "class_title": "Building Production AI Agents with ADK + FastAPI",
-        "total_agents": 9,
-        "duration": "4 hours",
-        "phases": [
-            {
-                "name": "Phase 1: Foundation",
-                "agents": ["greeting_agent"],
-                "pattern": "Single Agent"
-            },
-            {
-                "name": "Phase 2: Real Workflows",
-                "agents": ["customer_service", "content_pipeline", "medical_authorization"],
-                "pattern": "Sequential Workflows"
-            },
-            {
-                "name": "Phase 3: Intelligent Decision-Making",
-                "agents": ["financial_advisor", "brand_intelligence"],
-                "pattern": "Parallel + Synthesis"
-            },
-            {
-                "name": "Phase 4: Production-Grade Systems",
-                "agents": ["software_assistant", "project_management", "verified_recommendations"],
-                "pattern": "Complex Multi-Agent with Verification"
-            }
-        ],
-        "current_step": 1,
-        "next_agent": "customer_service",
-        "progression_file": "class_progression.yaml"
-    }
+    return CLASS_PROGRESSION.get()
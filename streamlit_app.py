@@ -1,7 +1,6 @@
 
 import streamlit as st
 import os
-import asyncio
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -9,16 +8,11 @@ load_dotenv()
 load_dotenv('greeting_agent/.env')
 load_dotenv('thoughtful_ai_agent/.env')
 
-from google import genai
-from google.genai import types
+from agent_runtime import BackgroundLoop, ChatSession, HistoryManager, RenderCoalescer, StatusChannel, chat_config
+from agent_runtime.metrics import configure_from_env
+from agent_runtime.registry import AgentRegistry
 
-# Import agents
-try:
-    from greeting_agent.agent import root_agent as greeting_agent
-    from thoughtful_ai_agent.agent import root_agent as thoughtful_agent
-except ImportError as e:
-    st.error(f"Failed to import agents: {e}")
-    st.stop()
+configure_from_env()
 
 # Page Config
 st.set_page_config(
@@ -40,26 +34,44 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Agents are discovered by directory and imported only when first selected
+@st.cache_resource
+def get_registry():
+    return AgentRegistry.discover(
+        os.path.dirname(os.path.abspath(__file__)),
+        display_names={
+            "greeting_agent": "Greeting Agent",
+            "thoughtful_ai_agent": "Thoughtful AI Agent",
+        },
+    )
+
+registry = get_registry()
+
 # Initialize Session State
 if "messages" not in st.session_state:
-    st.session_state.messages = {
-        "Greeting Agent": [],
-        "Thoughtful AI Agent": []
-    }
+    st.session_state.messages = {}
 
 # Sidebar
 st.sidebar.title("🤖 Agent Selector")
 selected_agent_name = st.sidebar.radio(
     "Choose an agent:",
-    ["Greeting Agent", "Thoughtful AI Agent"]
+    registry.names()
 )
+st.session_state.messages.setdefault(selected_agent_name, [])
 
-agent_map = {
-    "Greeting Agent": greeting_agent,
-    "Thoughtful AI Agent": thoughtful_agent
-}
+# Import agents
+try:
+    loaded_agent = registry.load(selected_agent_name)
+except ImportError as e:
+    st.error(f"Failed to import agents: {e}")
+    st.stop()
 
-current_agent = agent_map[selected_agent_name]
+current_agent = loaded_agent.agent
+st.sidebar.caption(f"Loaded in {loaded_agent.load_seconds * 1000:.0f} ms")
+
+@st.cache_resource
+def get_history_manager(agent_name, token_budget):
+    return HistoryManager(token_budget)
 
 # Display Agent Info
 st.markdown(f"""
@@ -69,70 +81,69 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
+# Long-lived resources: one client and one event loop per process, reused across reruns
+@st.cache_resource
+def get_client(api_key):
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+@st.cache_resource
+def get_event_loop():
+    return BackgroundLoop()
+
+@st.cache_resource
+def get_chat_config(agent_name, _agent):
+    """Map ADK agent properties to a GenAI config (built once per agent)."""
+    return chat_config(_agent)
+
+def get_chat_session(client, loaded):
+    """Return this browser session's ChatSession for the `loaded` agent, creating it on first use."""
+    sessions = st.session_state.setdefault("chat_sessions", {})
+    session = sessions.get(loaded.name)
+    if session is None:
+        session = sessions[loaded.name] = ChatSession(
+            client,
+            loaded,
+            get_history_manager(loaded.name, loaded.history_token_budget),
+            config=get_chat_config(loaded.name, loaded.agent),
+        )
+    return session
+
 # Helper function to run agent using GenAI SDK directly
-async def run_agent(agent, user_message, chat_history):
+def run_agent(loaded, user_message, chat_history):
     """Run ADK agent with streaming response using direct GenAI SDK"""
-    
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         st.error("GOOGLE_API_KEY not found in environment!")
         return
 
-    client = genai.Client(api_key=api_key)
-
-    # Build history for context
-    # Note: mixing "user" and "model" roles
-    history_content = []
-    for msg in chat_history:
-        role = "user" if msg["role"] == "user" else "model"
-        history_content.append(types.Content(
-            role=role,
-            parts=[types.Part(text=msg["content"])]
-        ))
-
-    # Configuration
-    # We map ADK agent properties to GenAI config
-    tools = agent.tools if hasattr(agent, 'tools') else None
-    instruction = agent.instruction if hasattr(agent, 'instruction') else None
-    
-    # Create the chat config
-    
-    chat = client.aio.chats.create(
-        model=agent.model,
-        history=history_content,
-        config=types.GenerateContentConfig(
-            system_instruction=instruction,
-            tools=tools,
-            temperature=0.3, # Default or from agent config if we parsed it
-            automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=False)
-        )
-    )
-
-    # Send message and stream response
-    
-    response_stream = await chat.send_message_stream(user_message)
+    loop = get_event_loop()
+    session = get_chat_session(get_client(api_key), loaded)
 
-    full_response = ""
+    # Async work (routing, the chat stream) runs on the shared loop,
+    # rendering stays on the script thread.
     message_placeholder = st.empty()
+    # Coalesce chunks so the growing response is re-rendered a few times per second,
+    # not once per chunk
+    renderer = RenderCoalescer(message_placeholder.markdown)
     
     # Status container to show "Thinking..." or tool activity if possible
     status_container = st.status("Agent is processing...", expanded=False)
-
-    async for chunk in response_stream:
-        # If we get text, show it
-        if chunk.text:
-            full_response += chunk.text
-            message_placeholder.markdown(full_response)
-            status_container.update(label="Responding...", state="running")
-        
-        # Check for function calls in the chunk (if exposed during auto-execution)
-        
-        if hasattr(chunk, 'function_calls') and chunk.function_calls:
-             for fc in chunk.function_calls:
-                 status_container.write(f"🛠️ Tool Used: `{fc.name}`")
+    status = StatusChannel(status_container.update, status_container.write)
+
+    for event in loop.iterate(session.reply(user_message, chat_history)):
+        # If we get text, buffer it
+        if event.text:
+            renderer.append(event.text)
+            status.set("Responding...")
+        # Function calls made during automatic function calling
+        for name in event.tool_calls:
+            status.tool_used(name)
     
-    status_container.update(label="Complete", state="complete")
-    return full_response
+    renderer.flush()
+    status.set("Answered from the knowledge base" if session.direct else "Complete", state="complete")
+    return renderer.text
 
 # Main Chat Loop
 st.divider()
@@ -159,7 +170,7 @@ if prompt := st.chat_input("Ask something..."):
     with st.chat_message("assistant"):
         history_for_api = st.session_state.messages[selected_agent_name][:-1]
         
-        response_text = asyncio.run(run_agent(current_agent, prompt, history_for_api))
+        response_text = run_agent(loaded_agent, prompt, history_for_api)
         
         # 3. Save Response
         st.session_state.messages[selected_agent_name].append(
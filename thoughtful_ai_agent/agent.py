@@ -4,14 +4,34 @@ Demonstrates Model Literacy and Hybrid Architecture with ADK.
 """
 
 from google.adk import Agent
+from agent_runtime.metrics import configure_from_env
+from agent_runtime.model_routing import ModelRouter
 from .config import THOUGHTFUL_AGENT_CONFIG, THOUGHTFUL_AGENT_DESCRIPTION, THOUGHTFUL_AGENT_INSTRUCTION, THOUGHTFUL_AGENT_MODEL
+from .config import THOUGHTFUL_AGENT_HISTORY_TOKEN_BUDGET, THOUGHTFUL_AGENT_MODEL_ROUTING
+from .router import kb_match_score, kb_router_callback, route_query_async
 from .tools import search_knowledge_base
 
+# Enable tool metrics / the /metrics endpoint when AGENT_METRICS is set
+configure_from_env()
+
+# Picks the model tier and output budget per request (see THOUGHTFUL_AGENT_MODEL_ROUTING)
+MODEL_ROUTER = ModelRouter("thoughtful_ai_agent", THOUGHTFUL_AGENT_MODEL_ROUTING, kb_score=kb_match_score)
+
 root_agent = Agent(
     name="thoughtful_ai_agent",
     model=THOUGHTFUL_AGENT_MODEL,
     generate_content_config=THOUGHTFUL_AGENT_CONFIG,
     description=THOUGHTFUL_AGENT_DESCRIPTION,
     instruction=THOUGHTFUL_AGENT_INSTRUCTION,
+    # High-confidence KB hits are answered directly, without an LLM call
+    before_agent_callback=kb_router_callback,
+    before_model_callback=MODEL_ROUTER.before_model_callback,
+    after_model_callback=MODEL_ROUTER.after_model_callback,
+    # Async tool: embedding calls must not stall the shared event loop.
+    # `search_knowledge_base_sync` remains available for scripts and the CLI.
     tools=[search_knowledge_base],
 )
+
+# Hooks read by agent_runtime.registry
+HISTORY_TOKEN_BUDGET = THOUGHTFUL_AGENT_HISTORY_TOKEN_BUDGET
+DIRECT_ROUTER = route_query_async
@@ -3,10 +3,14 @@ Agent prompts and configuration for the Thoughtful AI agent.
 Demonstrates Model Literacy and Configuration Rationale.
 """
 
+import os
+
 from google.genai import types
 from google.genai.types import GenerateContentConfig
 from google.genai.types import SafetySetting
 
+from agent_runtime.model_routing import ModelRoute, RouteRule, RoutingPolicy
+
 class ThoughtfulAIConfig(GenerateContentConfig):
     # Rationale: 300 allows elaboration without rambling (Cost Consciousness)
     max_output_tokens: int = 300
@@ -36,6 +40,108 @@ THOUGHTFUL_AGENT_MODEL: str = "gemini-2.0-flash-exp"
 
 THOUGHTFUL_AGENT_CONFIG = ThoughtfulAIConfig()
 
+# Rationale: output is capped at 300 tokens but input was not; support answers rarely need
+# more than the last few turns, so history beyond 2000 tokens is summarized (latency + cost).
+THOUGHTFUL_AGENT_HISTORY_TOKEN_BUDGET: int = 2000
+
+# Rationale: part of every embedding store key, and each model gets its own store directory,
+# so switching models never mixes vector spaces (or dimensions).
+EMBEDDING_MODEL: str = "text-embedding-004"
+
+# On-disk embedding store shared by every worker; warm stores make cold starts near-instant.
+EMBEDDING_STORE_DIR: str = os.getenv(
+    "THOUGHTFUL_EMBEDDING_STORE",
+    os.path.join(os.path.dirname(__file__), ".embedding_store"),
+)
+
+# Rationale: 100 is the per-request limit for batch embedding; 4 in flight stays under rate limits.
+EMBEDDING_BATCH_SIZE: int = 100
+EMBEDDING_MAX_CONCURRENCY: int = 4
+
+# Rationale: new embeddings are persisted every 5000 texts, so a failed ingestion of a large KB
+# resumes from the last written chunk instead of re-embedding (and re-paying for) everything.
+EMBEDDING_WRITE_CHUNK: int = 5000
+
+# Rationale: FAQ traffic repeats heavily; a small LRU removes most query embedding calls.
+# TTL (seconds) bounds staleness if the embedding model is swapped; None keeps entries until evicted.
+QUERY_CACHE_SIZE: int = 4096
+QUERY_CACHE_TTL: float | None = 24 * 60 * 60
+
+# Rationale: under load many sessions embed a query at the same moment. While a request is in
+# flight, new queries are held for at most 3 ms so they share one batched request (fewer
+# round-trips, rate-limit headroom); with nothing in flight a query is sent at once. 1 disables.
+QUERY_BATCH_WINDOW: float = 0.003
+QUERY_BATCH_MAX_SIZE: int = 32
+
+# Rationale: a query embedding normally returns in ~100 ms, but one slow call used to stall the
+# whole turn. Each query embedding now has a 1.5 s deadline shared by jittered retries, a hedged
+# duplicate is sent once a request is slower than the recent p95 (None disables), and past the
+# deadline the search degrades to the lexical index instead of failing.
+EMBEDDING_DEADLINE: float = 1.5
+EMBEDDING_MAX_ATTEMPTS: int = 3
+EMBEDDING_RETRY_BACKOFF: float = 0.05
+EMBEDDING_HEDGE_QUANTILE: float | None = 95.0
+
+# Pooled keep-alive connections for the embedding client (no TLS handshake per request)
+EMBEDDING_POOL_SIZE: int = 32
+EMBEDDING_KEEPALIVE_EXPIRY: float = 30.0
+
+# Optional JSONL/CSV knowledge base export (question/answer fields); defaults to QA_DATASET.
+KB_PATH: str | None = os.getenv("THOUGHTFUL_KB_PATH")
+
+# Rationale: exact scan is optimal for the small FAQ set; "ivf" keeps lookups sub-millisecond
+# for hundreds of thousands of entries. n_probe trades recall for latency (None lists = ~4*sqrt(N)).
+KB_INDEX_BACKEND: str = os.getenv("THOUGHTFUL_KB_INDEX", "exact")
+IVF_N_LISTS: int | None = None
+IVF_N_PROBE: int = 8
+
+# Rationale: float32 costs 4 bytes per dimension; "float16" (2) or "int8" (1) lets a
+# multi-million-entry KB fit in one worker's RAM. The exact scan runs on the compact codes and
+# the top KB_RESCORE_FACTOR * k candidates are re-scored at full precision from the store's
+# memory map, so recall stays near-exact (logged at startup). Exact backend only.
+KB_PRECISION: str = os.getenv("THOUGHTFUL_KB_PRECISION", "float32")
+KB_RESCORE_FACTOR: int = 4
+
+# Rationale: with several worker processes, one builds the index and publishes it here; the rest
+# memory-map it read-only instead of each holding (and embedding) a private copy. Workers pick up
+# a newer published generation within SHARED_INDEX_CHECK_INTERVAL seconds. Unset = per-process index.
+SHARED_INDEX_DIR: str | None = os.getenv("THOUGHTFUL_SHARED_INDEX")
+SHARED_INDEX_CHECK_INTERVAL: float = 1.0
+
+# Rationale: keyword-exact queries ("What is EVA?") are answered from the BM25 index with no
+# embedding call. Otherwise the top semantic candidates get a lexical boost:
+# hybrid = max(semantic, alpha * semantic + (1 - alpha) * lexical).
+LEXICAL_SHORTCUT_THRESHOLD: float = 0.9
+LEXICAL_MARGIN: float = 0.2
+HYBRID_ALPHA: float = 0.7
+HYBRID_CANDIDATES: int = 5
+
+# Rationale: answering FAQ hits straight from the KB skips the slowest, most expensive hop.
+# The bar is higher than the tool's 0.70 because no model reviews the answer.
+KB_ROUTER_ENABLED: bool = os.getenv("THOUGHTFUL_KB_ROUTER", "1") != "0"
+KB_ROUTER_THRESHOLD: float = 0.85
+
+# Rationale: most traffic is greetings or FAQ questions the KB already answers, where the model
+# only restates a verified answer; those go to Flash-Lite with a 150-token budget (faster TTFT,
+# ~25% cheaper). Long, low-scoring or deep-conversation queries keep the default model and budget.
+# Rules are tried in order; costs are USD per 1M tokens (list prices, estimated-cost metric only).
+GREETING_PATTERN: str = r"(hi|hello|hey|thanks|thank you|bye|goodbye|good (morning|afternoon|evening))\b"
+
+THOUGHTFUL_AGENT_MODEL_ROUTING = RoutingPolicy(
+    routes={
+        "fast": ModelRoute("gemini-2.0-flash-lite", max_output_tokens=150,
+                           input_cost_per_1m=0.075, output_cost_per_1m=0.30),
+        "standard": ModelRoute(THOUGHTFUL_AGENT_MODEL, max_output_tokens=THOUGHTFUL_AGENT_CONFIG.max_output_tokens,
+                               input_cost_per_1m=0.10, output_cost_per_1m=0.40),
+    },
+    rules=(
+        RouteRule("fast", pattern=GREETING_PATTERN, max_query_tokens=8),
+        # 0.70 is the tool's match threshold: the KB has the answer
+        RouteRule("fast", min_kb_score=0.70, max_query_tokens=40, max_depth=6),
+    ),
+    default="standard",
+)
+
 THOUGHTFUL_AGENT_DESCRIPTION: str = (
     "A healthcare support agent demonstrating model literacy and production principles."
 )
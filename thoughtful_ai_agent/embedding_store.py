@@ -0,0 +1,222 @@
+"""
+Persistent, content-addressed embedding store.
+Embeddings are keyed by a hash of (model, text) and kept in append-only,
+memory-mapped .npy segments per model, so a warm process only embeds entries
+it has never seen before and a write never rewrites existing rows.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialized
+    fcntl = None
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".write.lock"
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def content_key(model: str, text: str) -> str:
+    """Stable key for an embedding: sha256 of the model name and the exact text."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def model_directory(model: str) -> str:
+    """Filesystem-safe directory name for a model's vectors: "models/text-embedding-004" -> "models_text-embedding-004"."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+
+
+class SegmentedMatrix:
+    """Read-only (N, D) float32 view over row-wise concatenated segments (e.g. memory maps).
+
+    Indexing with an int, slice or array of rows copies only the selected rows.
+    """
+
+    def __init__(self, segments: Sequence[np.ndarray]):
+        self.segments = list(segments)
+        self.offsets = np.zeros(len(self.segments) + 1, dtype=np.int64)
+        np.cumsum([len(segment) for segment in self.segments], out=self.offsets[1:])
+        self.dtype = np.dtype(np.float32)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return int(self.offsets[-1]), (self.segments[0].shape[1] if self.segments else 0)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, rows) -> np.ndarray:
+        if isinstance(rows, (int, np.integer)):
+            row = int(rows) + (len(self) if rows < 0 else 0)
+            segment = int(np.searchsorted(self.offsets, row, side="right")) - 1
+            return np.asarray(self.segments[segment][row - self.offsets[segment]], dtype=np.float32)
+        if isinstance(rows, slice):
+            rows = np.arange(*rows.indices(len(self)))
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(self.segments) == 1:
+            return np.asarray(self.segments[0][rows], dtype=np.float32)
+        out = np.empty((len(rows), self.shape[1]), dtype=np.float32)
+        segment_ids = np.searchsorted(self.offsets, rows, side="right") - 1
+        for segment in np.unique(segment_ids):
+            mask = segment_ids == segment
+            out[mask] = self.segments[segment][rows[mask] - self.offsets[segment]]
+        return out
+
+
+class EmbeddingStore:
+    """On-disk embedding cache shared read-only by any number of processes.
+
+    Layout of `root` (one directory per model, so vector spaces and
+    dimensions never mix):
+        <model>/manifest.json       {"dim": D, "segments": [{"vectors": ..., "keys": ..., "rows": n}, ...]}
+        <model>/seg-<id>.npy        float32 matrix of one write
+        <model>/seg-<id>.keys       its keys, one per line; row i <-> line i
+
+    Writes are append-only: each adds one segment and then atomically
+    replaces the (small) manifest, so a write costs its own rows however
+    large the store is, and readers never observe a half-written store.
+    Writers are serialized by a file lock and append to the latest manifest,
+    so no writer drops another's keys.
+    """
+
+    def __init__(self, root: str, model: str):
+        self.root = root
+        self.model = model
+        self.path = os.path.join(root, model_directory(model))
+        self._rows: Dict[str, int] = {}
+        self._segments: List[Dict] = []
+        self._arrays: List[np.ndarray] = []
+        self._vectors: Optional[SegmentedMatrix] = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def load(self, attempts: int = 5) -> None:
+        """(Re)attach to the store on disk, memory-mapping the segments read-only.
+
+        Segments already attached are kept; only ones appended since are read.
+        Only a missing manifest means an empty store. If a segment it names
+        cannot be opened, the manifest is re-read (up to `attempts` times).
+        """
+        for _ in range(attempts):
+            try:
+                with open(os.path.join(self.path, MANIFEST_FILE), encoding="utf-8") as f:
+                    segments = json.load(f)["segments"]
+            except FileNotFoundError:
+                self._reset()
+                return
+            known = len(self._segments)
+            if segments[:known] != self._segments:
+                self._reset()
+                known = 0
+            try:
+                added = [self._open_segment(segment) for segment in segments[known:]]
+            except FileNotFoundError:
+                continue
+            for segment, (array, keys) in zip(segments[known:], added):
+                offset = len(self._rows)
+                self._rows.update((key, offset + row) for row, key in enumerate(keys))
+                self._segments.append(segment)
+                self._arrays.append(array)
+            self._vectors = SegmentedMatrix(self._arrays) if self._arrays else None
+            return
+        raise FileNotFoundError(f"Embedding store {self.path} kept changing while loading")
+
+    def _reset(self) -> None:
+        self._rows, self._segments, self._arrays, self._vectors = {}, [], [], None
+
+    def _open_segment(self, segment: Dict) -> Tuple[np.ndarray, List[str]]:
+        array = np.load(os.path.join(self.path, segment["vectors"]), mmap_mode="r")
+        with open(os.path.join(self.path, segment["keys"]), encoding="ascii") as f:
+            keys = f.read().split()
+        return array, keys
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        row = self._rows.get(content_key(self.model, text))
+        return None if row is None else self._vectors[row]
+
+    @property
+    def vectors(self) -> Optional[SegmentedMatrix]:
+        """Read-only view of every stored vector (None while the store is empty)."""
+        return self._vectors
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """Copy the given rows of `vectors` into an (N, D) float32 matrix."""
+        if not len(rows):
+            return np.empty((0, 0), dtype=np.float32)
+        return self._vectors[rows]
+
+    def resolve(self, texts: Sequence[str], embed: EmbedFn) -> np.ndarray:
+        """Return an (N, D) float32 matrix for `texts`, embedding only unseen entries.
+
+        `embed` receives the list of missing texts and returns their vectors in order.
+        Newly embedded vectors are persisted before returning.
+        """
+        return self.take(self.resolve_rows(texts, embed))
+
+    def resolve_rows(self, texts: Sequence[str], embed: EmbedFn, chunk_size: Optional[int] = None) -> np.ndarray:
+        """Like `resolve`, but return each text's row in `vectors` instead of copying vectors.
+
+        Missing texts are embedded and persisted `chunk_size` at a time (all at
+        once if None), so an ingestion that fails part-way resumes from the last
+        written chunk on the next call.
+        """
+        keys = [content_key(self.model, text) for text in texts]
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows:
+                missing.setdefault(key, text)
+
+        missing_keys, missing_texts = list(missing), list(missing.values())
+        step = chunk_size or len(missing_keys) or 1
+        for i in range(0, len(missing_keys), step):
+            new_vectors = np.asarray(embed(missing_texts[i:i + step]), dtype=np.float32)
+            self._write(missing_keys[i:i + step], new_vectors)
+
+        return np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    @contextlib.contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write(self, new_keys: List[str], new_vectors: np.ndarray) -> None:
+        with self._write_lock():
+            # Another process may have written since we loaded; append after its segments
+            self.load()
+            fresh = [i for i, key in enumerate(new_keys) if key not in self._rows]
+            if fresh:
+                self._append([new_keys[i] for i in fresh], new_vectors[fresh])
+
+    def _append(self, new_keys: List[str], new_vectors: np.ndarray) -> None:
+        if self._vectors is not None and self._vectors.shape[1] != new_vectors.shape[1]:
+            raise ValueError(f"Embedding store for {self.model} holds {self._vectors.shape[1]}-dim "
+                             f"vectors, got {new_vectors.shape[1]}-dim")
+        name = f"seg-{uuid.uuid4().hex}"
+        np.save(os.path.join(self.path, f"{name}.npy"), new_vectors)
+        with open(os.path.join(self.path, f"{name}.keys"), "w", encoding="ascii") as f:
+            f.write("\n".join(new_keys))
+        segments = self._segments + [{"vectors": f"{name}.npy", "keys": f"{name}.keys", "rows": len(new_keys)}]
+        tmp_manifest = os.path.join(self.path, f".{MANIFEST_FILE}.{uuid.uuid4().hex}")
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({"dim": int(new_vectors.shape[1]), "segments": segments}, f)
+        os.replace(tmp_manifest, os.path.join(self.path, MANIFEST_FILE))
+        self.load()
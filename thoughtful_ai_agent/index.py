@@ -0,0 +1,341 @@
+"""
+Vector indexes for the Thoughtful AI knowledge base.
+Embeddings are held as pre-normalized float32 matrices. ExactIndex scores a
+query with a single matrix-vector product; IVFIndex probes only the closest
+k-means clusters for large knowledge bases; QuantizedIndex scans float16/int8
+codes and re-scores the best candidates at full precision.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """Return a contiguous float32 copy of `vectors` with unit-length rows.
+
+    Zero rows stay zero so they score 0.0 against every query.
+    """
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the `k` highest scores (descending) and their row indices."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(scores.shape[0])
+    order = np.argsort(scores[candidates])[::-1]
+    indices = candidates[order]
+    return scores[indices], indices
+
+
+class RowSubset(NamedTuple):
+    """Rows `rows` of `source` (e.g. a memory-mapped store), copied chunk by chunk when written."""
+    source: np.ndarray
+    rows: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.rows), self.source.shape[1] if len(self.rows) else 0)
+
+    def chunks(self, chunk_size: int = 65536) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (start, float32 rows) pieces covering the subset in order."""
+        for start in range(0, len(self.rows), chunk_size):
+            yield start, np.asarray(self.source[self.rows[start:start + chunk_size]], dtype=np.float32)
+
+
+class VectorIndex(ABC):
+    """Interface shared by every index backend."""
+
+    name: str
+    matrix: np.ndarray
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    def _normalize_query(self, query: Sequence[float]) -> np.ndarray:
+        q = normalize_rows(query)[0]
+        if q.shape[0] != self.dim:
+            raise ValueError(f"Query has dimension {q.shape[0]}, index expects {self.dim}")
+        return q
+
+    @abstractmethod
+    def search(self, query: Sequence[float], k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the top-k cosine scores (descending) and row indices for `query`."""
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """The arrays that fully describe this index (for publishing to disk).
+
+        Values may also be a RowSubset, which the publisher writes chunk by chunk.
+        """
+        return {"matrix": self.matrix}
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray], **params) -> "VectorIndex":
+        """Rebuild an index around existing arrays (e.g. memory-mapped) without copying them."""
+        index = cls.__new__(cls)
+        index.__dict__.update(arrays)
+        return index
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force cosine similarity over a pre-normalized embedding matrix."""
+
+    name = "exact"
+
+    def __init__(self, vectors: Sequence[Sequence[float]]):
+        if len(vectors) == 0:
+            self.matrix = np.empty((0, 0), dtype=np.float32)
+        else:
+            self.matrix = normalize_rows(vectors)
+
+    def search(self, query: Sequence[float], k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return top_k(np.empty(0, dtype=np.float32), k)
+        return top_k(self.matrix @ self._normalize_query(query), k)
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+    """Nearest centroid (by cosine) for every row, computed in bounded-memory chunks."""
+    labels = np.empty(matrix.shape[0], dtype=np.int64)
+    for start in range(0, matrix.shape[0], chunk_size):
+        labels[start:start + chunk_size] = np.argmax(matrix[start:start + chunk_size] @ centroids.T, axis=1)
+    return labels
+
+
+def _train_centroids(matrix: np.ndarray, n_lists: int, n_iter: int, seed: int) -> np.ndarray:
+    """Spherical k-means on a sample of at most 64 rows per list."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(matrix.shape[0], n_lists * 64)
+    sample = matrix[rng.choice(matrix.shape[0], sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _assign(sample, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        present = counts > 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+        sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+        empty = ~sums.any(axis=1)
+        # Re-seed empty lists from random sample rows so no list is wasted
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex(VectorIndex):
+    """Inverted-file approximate index: k-means lists, probe the `n_probe` closest.
+
+    Rows are stored grouped by list so every probed list is a contiguous slice.
+    Knobs:
+        n_lists: number of clusters (default ~4*sqrt(N)); more lists = smaller scans.
+        n_probe: lists scanned per query; higher = better recall, more latency.
+    """
+
+    name = "ivf"
+
+    def __init__(self, vectors: Sequence[Sequence[float]], n_lists: Optional[int] = None,
+                 n_probe: int = 8, n_iter: int = 10, seed: int = 0):
+        matrix = normalize_rows(vectors) if len(vectors) else np.empty((0, 0), dtype=np.float32)
+        n = matrix.shape[0]
+        self.n_lists = max(1, min(n, n_lists or int(4 * np.sqrt(n)))) if n else 0
+        self.n_probe = n_probe
+        if n == 0:
+            self.matrix, self.ids = matrix, np.empty(0, dtype=np.int64)
+            self.centroids = np.empty((0, 0), dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            return
+
+        self.centroids = _train_centroids(matrix, self.n_lists, n_iter, seed)
+        labels = _assign(matrix, self.centroids)
+        self.ids = np.argsort(labels, kind="stable")
+        self.matrix = np.ascontiguousarray(matrix[self.ids])
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=self.n_lists))])
+
+    def search(self, query: Sequence[float], k: int = 1,
+               n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return top_k(np.empty(0, dtype=np.float32), k)
+        q = self._normalize_query(query)
+        _, lists = top_k(self.centroids @ q, n_probe or self.n_probe)
+        scores, positions = [], []
+        for lst in lists:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if end > start:
+                scores.append(self.matrix[start:end] @ q)
+                positions.append(np.arange(start, end))
+        best, order = top_k(np.concatenate(scores), k)
+        return best, self.ids[np.concatenate(positions)[order]]
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"matrix": self.matrix, "ids": self.ids, "centroids": self.centroids, "offsets": self.offsets}
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray], n_probe: int = 8, **params) -> "IVFIndex":
+        index = super().from_state(arrays)
+        index.n_lists = len(index.offsets) - 1
+        index.n_probe = n_probe
+        return index
+
+
+def quantize(matrix: np.ndarray, precision: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Encode unit-length rows as float16 codes, or int8 codes plus a per-row scale."""
+    if precision == "float16":
+        return matrix.astype(np.float16), None
+    if precision == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        return np.rint(matrix / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    raise ValueError(f"Unknown precision: {precision!r}")
+
+
+class QuantizedIndex(VectorIndex):
+    """Exact scan over float16 or int8 codes, re-scored at full precision.
+
+    The scan keeps 2 (float16) or 1 (int8) byte per dimension resident instead of 4
+    and selects `rescore` * k candidates; only those rows are read back from `vectors`
+    (typically the embedding store's memory map) and re-ranked exactly.
+
+    Args:
+        vectors: Full-precision embeddings, normalized or not (may be a memmap).
+        precision: "float16" or "int8".
+        rows: Row of `vectors` for each index row (default: every row, in order).
+        rescore: Candidates re-scored per requested result.
+        chunk_size: Rows decoded per step of the scan, bounding temporary memory.
+    """
+
+    name = "quantized"
+
+    def __init__(self, vectors: Sequence[Sequence[float]], precision: str = "int8",
+                 rows: Optional[np.ndarray] = None, rescore: int = 4, chunk_size: int = 65536):
+        if not hasattr(vectors, "shape"):  # arrays, memmaps and store views are indexed in place
+            vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        self.full = vectors
+        self.rows = np.arange(len(vectors)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.rescore = rescore
+        self.chunk_size = chunk_size
+        n, dim = len(self.rows), (vectors.shape[1] if len(self.rows) else 0)
+        self.matrix = np.empty((n, dim), dtype=np.float16 if precision == "float16" else np.int8)
+        self.scales = np.empty(n, dtype=np.float32) if precision == "int8" else None
+        for start in range(0, n, chunk_size):
+            codes, scales = quantize(normalize_rows(vectors[self.rows[start:start + chunk_size]]), precision)
+            self.matrix[start:start + chunk_size] = codes
+            if scales is not None:
+                self.scales[start:start + chunk_size] = scales
+
+    @property
+    def precision(self) -> str:
+        return "int8" if self.matrix.dtype == np.int8 else "float16"
+
+    def _scan(self, q: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), self.chunk_size):
+            scores[start:start + self.chunk_size] = self.matrix[start:start + self.chunk_size].astype(np.float32) @ q
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def _rescore(self, q: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        return normalize_rows(self.full[self.rows[candidates]]) @ q
+
+    def search(self, query: Sequence[float], k: int = 1,
+               rescore: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return top_k(np.empty(0, dtype=np.float32), k)
+        q = self._normalize_query(query)
+        if not rescore:
+            return top_k(self._scan(q), k)
+        _, candidates = top_k(self._scan(q), k * self.rescore)
+        scores, order = top_k(self._rescore(q, candidates), k)
+        return scores, candidates[order]
+
+    def exact_search(self, query: Sequence[float], k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Full-precision scan of every row: the reference for recall measurements."""
+        if len(self) == 0:
+            return top_k(np.empty(0, dtype=np.float32), k)
+        q = self._normalize_query(query)
+        scores = np.concatenate([
+            self._rescore(q, np.arange(start, min(start + self.chunk_size, len(self))))
+            for start in range(0, len(self), self.chunk_size)
+        ])
+        return top_k(scores, k)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        # Only this index's rows of `full` are published (not the whole store), renumbered in order
+        arrays = {"matrix": self.matrix, "full": RowSubset(self.full, self.rows),
+                  "rows": np.arange(len(self.rows), dtype=np.int64)}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        return arrays
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray], rescore: int = 4, chunk_size: int = 65536,
+                   **params) -> "QuantizedIndex":
+        index = super().from_state({"scales": None, **arrays})
+        index.rescore = rescore
+        index.chunk_size = chunk_size
+        return index
+
+
+def quantization_recall(index: QuantizedIndex, queries: Sequence[Sequence[float]],
+                        k: int = 10) -> Dict[str, float]:
+    """Recall@k of the quantized scan versus the full-precision scan, with and without re-scoring."""
+    found = {"rescored": 0, "scan_only": 0}
+    total = 0
+    for query in queries:
+        _, expected = index.exact_search(query, k)
+        found["rescored"] += len(np.intersect1d(expected, index.search(query, k)[1]))
+        found["scan_only"] += len(np.intersect1d(expected, index.search(query, k, rescore=False)[1]))
+        total += len(expected)
+    return {path: (count / total if total else 1.0) for path, count in found.items()}
+
+
+BACKENDS = {backend.name: backend for backend in (ExactIndex, IVFIndex, QuantizedIndex)}
+
+
+def build_index(vectors: Sequence[Sequence[float]], backend: str = "exact",
+                precision: str = "float32", **params) -> VectorIndex:
+    """Construct an index backend by name ("exact", "ivf" or "quantized").
+
+    A `precision` of "float16" or "int8" with the exact backend selects QuantizedIndex.
+    """
+    if precision != "float32":
+        if backend not in ("exact", "quantized"):
+            raise ValueError(f"Quantized storage is only supported by the exact backend, not {backend!r}")
+        return QuantizedIndex(vectors, precision, **params)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown index backend: {backend!r}")
+    return BACKENDS[backend](vectors, **params)
+
+
+def load_index(backend: str, arrays: Dict[str, np.ndarray], **params) -> VectorIndex:
+    """Counterpart of `VectorIndex.state`: wrap published arrays in the named backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown index backend: {backend!r}")
+    return BACKENDS[backend].from_state(arrays, **params)
+
+
+def recall_at_k(index: VectorIndex, reference: VectorIndex, queries: Sequence[Sequence[float]],
+                k: int = 10) -> float:
+    """Fraction of the reference (exact) top-k neighbours that `index` also returns."""
+    found = total = 0
+    for query in queries:
+        _, expected = reference.search(query, k)
+        _, actual = index.search(query, k)
+        found += len(np.intersect1d(expected, actual))
+        total += len(expected)
+    return found / total if total else 1.0
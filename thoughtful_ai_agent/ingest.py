@@ -0,0 +1,88 @@
+"""
+Batched, concurrent embedding ingestion for the knowledge base.
+Sends fixed-size batches with a bounded number in flight, retries each batch
+independently and logs progress/throughput as batches complete.
+"""
+
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from agent_runtime.resilience import is_transient
+
+logger = logging.getLogger(__name__)
+
+BatchEmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def _embed_with_retry(embed_batch: BatchEmbedFn, batch: List[str],
+                      max_retries: int, backoff: float) -> np.ndarray:
+    for attempt in range(max_retries + 1):
+        try:
+            vectors = np.asarray(embed_batch(batch), dtype=np.float32)
+        except Exception as e:
+            if attempt == max_retries or not is_transient(e):
+                raise
+            delay = backoff * (2 ** attempt) * (1 + random.random())
+            logger.warning("Embedding batch of %d failed (%s); retrying in %.2fs", len(batch), e, delay)
+            time.sleep(delay)
+            continue
+        if vectors.ndim != 2 or len(vectors) != len(batch):
+            raise ValueError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        return vectors
+
+
+def embed_texts(texts: Sequence[str], embed_batch: BatchEmbedFn, batch_size: int = 100,
+                max_concurrency: int = 4, max_retries: int = 3,
+                backoff: float = 0.5) -> np.ndarray:
+    """Embed `texts` in batches of `batch_size`, keeping up to `max_concurrency` in flight.
+
+    Args:
+        texts: Texts to embed.
+        embed_batch: Callable embedding a list of texts in one request, preserving order.
+        batch_size: Texts per request.
+        max_concurrency: Maximum number of batch requests in flight.
+        max_retries: Retries per batch on transient errors (see
+            `agent_runtime.resilience.is_transient`) before the whole ingestion
+            fails; other errors fail it at once. Batches not yet started are
+            then cancelled.
+        backoff: Base delay in seconds for jittered exponential backoff.
+
+    Returns:
+        np.ndarray: (N, D) float32 matrix, one row per input text, in input order.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    starts = range(0, len(texts), batch_size)
+    result: Optional[np.ndarray] = None
+    done = 0
+    start = time.perf_counter()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+    try:
+        futures = {
+            pool.submit(_embed_with_retry, embed_batch, texts[i:i + batch_size], max_retries, backoff): i
+            for i in starts
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            vectors = future.result()
+            if result is None:
+                # Filled batch by batch, so peak memory is the float32 matrix itself
+                result = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            result[i:i + len(vectors)] = vectors
+            done += len(vectors)
+            elapsed = time.perf_counter() - start
+            logger.info("Embedded %d/%d texts (%.1f texts/s)", done, len(texts),
+                        done / elapsed if elapsed > 0 else float("inf"))
+    finally:
+        # After a failed batch, drop queued batches instead of spending quota on discarded results
+        pool.shutdown(cancel_futures=True)
+
+    return result
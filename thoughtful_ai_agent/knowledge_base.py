@@ -0,0 +1,129 @@
+"""
+Compact knowledge base representation and streaming loaders.
+Answers are interned into a shared table that questions reference by id, so
+an answer repeated across many phrasings is stored once.
+"""
+
+import csv
+import json
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+
+class AnswerTable:
+    """Deduplicated answer strings addressed by integer id."""
+
+    __slots__ = ("_answers", "_ids")
+
+    def __init__(self):
+        self._answers: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def __getitem__(self, answer_id: int) -> str:
+        return self._answers[answer_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._answers)
+
+    def intern(self, answer: str) -> int:
+        """Return the id of `answer`, adding it to the table if it is new."""
+        answer_id = self._ids.get(answer)
+        if answer_id is None:
+            answer_id = self._ids[answer] = len(self._answers)
+            self._answers.append(answer)
+        return answer_id
+
+
+class QARecord:
+    """A single question and the id of its answer in the owning AnswerTable."""
+
+    __slots__ = ("question", "answer_id")
+
+    def __init__(self, question: str, answer_id: int):
+        self.question = question
+        self.answer_id = answer_id
+
+    def __repr__(self) -> str:
+        return f"QARecord(question={self.question!r}, answer_id={self.answer_id})"
+
+
+class KnowledgeBase:
+    """Questions plus a parallel array of answer ids into a shared AnswerTable.
+
+    Row i of the knowledge base is row i of its embedding matrix.
+    """
+
+    __slots__ = ("questions", "answer_ids", "answers")
+
+    def __init__(self):
+        self.questions: List[str] = []
+        self.answer_ids = array("I")
+        self.answers = AnswerTable()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __getitem__(self, row: int) -> QARecord:
+        return QARecord(self.questions[row], self.answer_ids[row])
+
+    def add(self, question: str, answer: str) -> None:
+        self.questions.append(question)
+        self.answer_ids.append(self.answers.intern(answer))
+
+    def answer(self, row: int) -> str:
+        """Answer text for knowledge base row `row`."""
+        return self.answers[self.answer_ids[row]]
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]]) -> "KnowledgeBase":
+        kb = cls()
+        for question, answer in pairs:
+            kb.add(question, answer)
+        return kb
+
+    @classmethod
+    def from_columns(cls, questions: Sequence[str], answer_ids: Sequence[int],
+                     answers: Sequence[str]) -> "KnowledgeBase":
+        """Wrap prebuilt read-only columns (e.g. memory-mapped tables) without copying them."""
+        kb = cls.__new__(cls)
+        kb.questions, kb.answer_ids, kb.answers = questions, answer_ids, answers
+        return kb
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, str]]) -> "KnowledgeBase":
+        """Build from dicts with "question" and "answer" keys (e.g. QA_DATASET)."""
+        return cls.from_pairs((record["question"], record["answer"]) for record in records)
+
+
+def iter_jsonl(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream (question, answer) pairs from a JSON Lines file, one line at a time."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield record["question"], record["answer"]
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path}:{line_no}: invalid Q&A record ({e})") from e
+
+
+def iter_csv(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream (question, answer) pairs from a CSV file with question/answer columns."""
+    with open(path, encoding="utf-8", newline="") as f:
+        for record in csv.DictReader(f):
+            yield record["question"], record["answer"]
+
+
+def load_knowledge_base(path: str) -> KnowledgeBase:
+    """Stream a .jsonl or .csv export into a compact KnowledgeBase."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return KnowledgeBase.from_pairs(iter_jsonl(path))
+    if ext == ".csv":
+        return KnowledgeBase.from_pairs(iter_csv(path))
+    raise ValueError(f"Unsupported knowledge base format: {path}")
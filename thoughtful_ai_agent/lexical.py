@@ -0,0 +1,132 @@
+"""
+Lexical (BM25) index over knowledge base questions.
+Lets queries with exact product keywords (EVA, CAM, PHIL) be answered locally,
+without paying for a remote embedding call.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .index import top_k
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are about be can do does for how i is it me of on or s tell the"
+    " to what when where which who why with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case alphanumeric tokens with common question words removed."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring.
+
+    Postings are held as flat arrays (sorted vocabulary, per-term offsets into
+    concatenated doc ids and term frequencies), so a published index can be
+    memory-mapped by other processes instead of re-tokenizing every question.
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(documents)
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = np.zeros(self.n_docs, dtype=np.float32)
+        for doc_id, document in enumerate(documents):
+            tokens = tokenize(document)
+            lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc_id, tf))
+
+        avg_len = float(lengths.mean()) if self.n_docs and lengths.mean() > 0 else 1.0
+        # Per-document length normalization is fixed at build time
+        self._norm = k1 * (1 - b + b * lengths / avg_len)
+        vocabulary = sorted(postings)
+        self._terms = np.array([term.encode("ascii") for term in vocabulary], dtype=bytes)
+        self._offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term]) for term in vocabulary], out=self._offsets[1:])
+        self._docs = np.array([d for term in vocabulary for d, _ in postings[term]], dtype=np.int64)
+        self._tf = np.array([tf for term in vocabulary for _, tf in postings[term]], dtype=np.float32)
+        # Each document's score against itself: the best any query can do on that document
+        df = np.diff(self._offsets)
+        idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+        contributions = np.repeat(idf, df) * self._tf * (k1 + 1) / (self._tf + self._norm[self._docs])
+        self._self_scores = np.bincount(self._docs, weights=contributions, minlength=self.n_docs).astype(np.float32)
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """The arrays that fully describe this index (for publishing to disk)."""
+        return {
+            "terms": self._terms,
+            "offsets": self._offsets,
+            "docs": self._docs,
+            "tf": self._tf,
+            "norm": self._norm,
+            "self_scores": self._self_scores,
+            "params": np.array([self.k1, self.b], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray]) -> "BM25Index":
+        """Rebuild an index around existing arrays (e.g. memory-mapped) without copying them."""
+        index = cls.__new__(cls)
+        index.k1, index.b = (float(value) for value in arrays["params"])
+        index.n_docs = len(arrays["norm"])
+        index._terms, index._offsets = arrays["terms"], arrays["offsets"]
+        index._docs, index._tf = arrays["docs"], arrays["tf"]
+        index._norm, index._self_scores = arrays["norm"], arrays["self_scores"]
+        return index
+
+    def _postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(doc ids, term frequencies) of `term`, or None if no document contains it."""
+        key = term.encode("ascii")
+        i = int(np.searchsorted(self._terms, key))
+        if i == len(self._terms) or self._terms[i] != key:
+            return None
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._docs[start:end], self._tf[start:end]
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def idf(self, term: str) -> float:
+        postings = self._postings(term)
+        return self._idf(len(postings[0]) if postings is not None else 0)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of `query` against every document, normalized to [0, 1].
+
+        Each document's score is divided by the larger of its score against
+        itself and the score it would get if it contained every query term
+        once. A query identical to a stored question therefore scores 1.0 at
+        any question length; terms the document lacks (including terms unknown
+        to the index) and document terms the query lacks both lower the score.
+        """
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        terms = tokenize(query)
+        if not terms or not self.n_docs:
+            return scores
+        query_idf = 0.0
+        for term in terms:
+            postings = self._postings(term)
+            idf = self._idf(len(postings[0]) if postings is not None else 0)
+            query_idf += idf
+            if postings is not None:
+                docs, tf = postings
+                scores[docs] += idf * tf * (self.k1 + 1) / (tf + self._norm[docs])
+        ideal = np.maximum(self._self_scores, query_idf * (self.k1 + 1) / (1 + self._norm))
+        return np.minimum(scores / ideal, 1.0) if query_idf > 0 else scores
+
+    def search(self, query: str, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the top-k normalized BM25 scores (descending) and document indices."""
+        return top_k(self.scores(query), k)
@@ -0,0 +1,84 @@
+"""
+Bounded per-query cache.
+Support traffic is highly repetitive, so values computed from a query (its
+embedding, its best KB match score) are cached under the normalized query text
+with LRU eviction and an optional TTL.
+"""
+
+import re
+import string
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+_WHITESPACE = re.compile(r"\s+")
+
+V = TypeVar("V")
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace: "What is EVA? " -> "what is eva"."""
+    return _WHITESPACE.sub(" ", text.casefold().translate(_PUNCTUATION)).strip()
+
+
+class QueryCache(Generic[V]):
+    """Thread-safe LRU cache keyed by normalized query text, with optional TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[V]:
+        key = normalize_query(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, text: str, value: V) -> None:
+        if self.max_size <= 0:
+            return
+        key = normalize_query(text)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, text: str, compute: Callable[[str], V]) -> V:
+        """Return the cached value for `text`, computing and storing it on a miss."""
+        value = self.get(text)
+        if value is None:
+            value = compute(text)
+            self.put(text, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,114 @@
+"""
+Knowledge-base router in front of the Thoughtful AI agent.
+High-confidence KB hits are answered verbatim from the stored answer, skipping
+the LLM generation round entirely; everything else falls through to the model.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+from google.genai import types
+
+from agent_runtime import metrics
+from .config import KB_ROUTER_ENABLED, KB_ROUTER_THRESHOLD
+from .query_cache import QueryCache
+from .tools import KBMatch, find_best_match, find_best_match_async
+
+logger = logging.getLogger(__name__)
+
+metrics.REGISTRY.describe("thoughtful_router_requests_total", "Requests by route (kb = answered directly, llm = fallthrough).")
+
+
+class RouterStats:
+    """Counts requests answered directly from the KB versus sent to the LLM."""
+
+    def __init__(self):
+        self.direct = 0
+        self.fallthrough = 0
+        self._lock = threading.Lock()
+
+    def record(self, direct: bool) -> None:
+        with self._lock:
+            if direct:
+                self.direct += 1
+            else:
+                self.fallthrough += 1
+        metrics.inc("thoughtful_router_requests_total", route="kb" if direct else "llm")
+
+    def stats(self) -> Dict[str, float]:
+        total = self.direct + self.fallthrough
+        return {
+            "direct": self.direct,
+            "fallthrough": self.fallthrough,
+            "hit_rate": self.direct / total if total else 0.0,
+        }
+
+
+ROUTER_STATS = RouterStats()
+
+metrics.REGISTRY.register_collector(
+    lambda: [("thoughtful_router_hit_rate", {}, ROUTER_STATS.stats()["hit_rate"])]
+)
+
+
+# Best match scores of recently routed queries, reused as the model router's KB signal so a
+# fallthrough query is not searched twice
+_RECENT_SCORES: QueryCache[float] = QueryCache(max_size=1024, ttl=60.0)
+
+
+def _direct_answer(match: KBMatch) -> Optional[str]:
+    if match.answer is not None and match.score >= KB_ROUTER_THRESHOLD:
+        return match.answer
+    return None
+
+
+def route_query(query: str) -> Optional[str]:
+    """Return the stored answer for a high-confidence KB hit, or None to use the LLM."""
+    if not KB_ROUTER_ENABLED or not query.strip():
+        return None
+    try:
+        match = find_best_match(query)
+        _RECENT_SCORES.put(query, match.score)
+        answer = _direct_answer(match)
+    except Exception:
+        logger.exception("KB router lookup failed; falling through to the LLM")
+        answer = None
+    ROUTER_STATS.record(answer is not None)
+    return answer
+
+
+async def route_query_async(query: str) -> Optional[str]:
+    """Async variant of `route_query`."""
+    if not KB_ROUTER_ENABLED or not query.strip():
+        return None
+    try:
+        match = await find_best_match_async(query)
+        _RECENT_SCORES.put(query, match.score)
+        answer = _direct_answer(match)
+    except Exception:
+        logger.exception("KB router lookup failed; falling through to the LLM")
+        answer = None
+    ROUTER_STATS.record(answer is not None)
+    return answer
+
+
+async def kb_match_score(query: str) -> float:
+    """Best KB match score for `query`, a model-routing signal (usually cached by the router)."""
+    score = _RECENT_SCORES.get(query)
+    if score is None:
+        score = (await find_best_match_async(query)).score
+        _RECENT_SCORES.put(query, score)
+    return score
+
+
+async def kb_router_callback(callback_context) -> Optional[types.Content]:
+    """ADK before_agent_callback: returning Content skips the model and replies with it."""
+    user_content = callback_context.user_content
+    if user_content is None or not user_content.parts:
+        return None
+    query = "".join(part.text for part in user_content.parts if part.text)
+    answer = await route_query_async(query)
+    if answer is None:
+        return None
+    return types.Content(role="model", parts=[types.Part(text=answer)])
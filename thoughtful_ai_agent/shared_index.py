@@ -0,0 +1,210 @@
+"""
+Knowledge base snapshots shared by every worker process.
+One process builds the vector and BM25 indexes and publishes their arrays,
+questions and answer table as .npy files; every worker memory-maps them read-only, so the page
+cache holds a single copy however many workers attach. A generation counter
+lets a rebuilt snapshot be swapped in without restarting workers.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .index import RowSubset, VectorIndex, load_index
+from .knowledge_base import KnowledgeBase
+from .lexical import BM25Index
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishers are not serialized
+    fcntl = None
+
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+LOCK_FILE = ".publish.lock"
+
+
+class StringTable(Sequence[str]):
+    """Read-only strings packed into one UTF-8 buffer plus an offsets array."""
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("StringTable index out of range")
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+    @staticmethod
+    def pack(strings) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode `strings` into (blob, offsets) arrays."""
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class SharedSnapshot(NamedTuple):
+    """A published knowledge base and indexes attached from disk.
+
+    `lexical` is None for generations published without a BM25 index.
+    """
+    generation: int
+    fingerprint: str
+    kb: KnowledgeBase
+    index: VectorIndex
+    lexical: Optional[BM25Index] = None
+
+
+def read_current(root: str) -> Optional[Dict]:
+    """The CURRENT pointer ({"generation": N, "dir": ...}), or None if nothing is published."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@contextlib.contextmanager
+def publish_lock(root: str) -> Iterator[None]:
+    """Serialize builders across processes so only one worker embeds and publishes."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _save(path: str, value) -> None:
+    if isinstance(value, RowSubset):
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=value.shape)
+        for start, chunk in value.chunks():
+            out[start:start + len(chunk)] = chunk
+        out.flush()
+        del out
+    else:
+        np.save(path, value)
+
+
+def publish(root: str, kb: KnowledgeBase, index: VectorIndex, fingerprint: str,
+            lexical: Optional[BM25Index] = None, keep: int = 2) -> int:
+    """Write `kb`, `index` and (optionally) its BM25 `lexical` index as a new generation
+    and point CURRENT at it.
+
+    Files are written into a private directory that is renamed into place
+    before CURRENT is atomically replaced, so readers never see a partial
+    snapshot. Only the newest `keep` generations are retained; workers still
+    mapping an older one keep their (unlinked) view until they swap.
+    """
+    current = read_current(root)
+    generation = (current["generation"] if current else 0) + 1
+    name = f"gen-{generation}"
+    tmp = os.path.join(root, f".{name}-{uuid.uuid4().hex}")
+    os.makedirs(tmp)
+
+    arrays = {f"index_{key}": value for key, value in index.state().items()}
+    if lexical is not None:
+        arrays.update((f"lexical_{key}", value) for key, value in lexical.state().items())
+    arrays["questions_blob"], arrays["questions_offsets"] = StringTable.pack(kb.questions)
+    arrays["answers_blob"], arrays["answers_offsets"] = StringTable.pack(kb.answers)
+    arrays["answer_ids"] = np.asarray(kb.answer_ids, dtype=np.uint32)
+    for key, value in arrays.items():
+        _save(os.path.join(tmp, f"{key}.npy"), value)
+    with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"generation": generation, "fingerprint": fingerprint, "backend": index.name,
+                   "rows": len(kb), "arrays": sorted(arrays), "published_at": time.time()}, f)
+
+    target = os.path.join(root, name)
+    shutil.rmtree(target, ignore_errors=True)  # leftover from a crashed publisher
+    os.rename(tmp, target)
+    tmp_current = os.path.join(root, f".{CURRENT_FILE}.{uuid.uuid4().hex}")
+    with open(tmp_current, "w", encoding="utf-8") as f:
+        json.dump({"generation": generation, "dir": name}, f)
+    os.replace(tmp_current, os.path.join(root, CURRENT_FILE))
+
+    for entry in os.listdir(root):
+        if entry.startswith("gen-") and entry[4:].isdigit() and int(entry[4:]) <= generation - keep:
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+    return generation
+
+
+def attach(root: str, fingerprint: Optional[str] = None, **params) -> Optional[SharedSnapshot]:
+    """Memory-map the current generation read-only.
+
+    Returns None if nothing is published, or if `fingerprint` is given and the
+    published snapshot was built from different source data. `params` are
+    passed to the index backend (e.g. n_probe).
+    """
+    current = read_current(root)
+    if current is None:
+        return None
+    directory = os.path.join(root, current["dir"])
+    try:
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {key: np.load(os.path.join(directory, f"{key}.npy"), mmap_mode="r") for key in meta["arrays"]}
+    except FileNotFoundError:
+        return None  # superseded and cleaned up between reading CURRENT and the files
+    if fingerprint is not None and meta["fingerprint"] != fingerprint:
+        return None
+
+    kb = KnowledgeBase.from_columns(
+        StringTable(arrays["questions_blob"], arrays["questions_offsets"]),
+        arrays["answer_ids"],
+        StringTable(arrays["answers_blob"], arrays["answers_offsets"]),
+    )
+    index_arrays = {key[len("index_"):]: value for key, value in arrays.items() if key.startswith("index_")}
+    index = load_index(meta["backend"], index_arrays, **params)
+    lexical_arrays = {key[len("lexical_"):]: value for key, value in arrays.items() if key.startswith("lexical_")}
+    lexical = BM25Index.from_state(lexical_arrays) if lexical_arrays else None
+    return SharedSnapshot(meta["generation"], meta["fingerprint"], kb, index, lexical)
+
+
+class GenerationWatcher:
+    """Reports the published generation, re-reading CURRENT only when it changes.
+
+    CURRENT is stat'ed at most once every `check_interval` seconds, so polling
+    on every query costs a clock read.
+    """
+
+    def __init__(self, root: str, check_interval: float = 1.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._checked_at = float("-inf")
+        self._mtime: Optional[int] = None
+        self._generation: Optional[int] = None
+
+    def latest(self) -> Optional[int]:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._generation
+        self._checked_at = now
+        try:
+            mtime = os.stat(os.path.join(self.root, CURRENT_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return self._generation
+        if mtime != self._mtime:
+            current = read_current(self.root)
+            if current is not None:
+                self._mtime, self._generation = mtime, current["generation"]
+        return self._generation
@@ -3,9 +3,60 @@ Custom tools for thoughtful_ai_agent.
 Demonstrates Hybrid Architecture (Semantic Matching + LLM Fallback).
 """
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import threading
+import weakref
+import numpy as np
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
 from google import genai
-from typing import List, Dict, Optional, Tuple
+from google.genai import types
+
+from agent_runtime import AsyncMicroBatcher, MicroBatcher, metrics
+from agent_runtime.resilience import CallPolicy, DeadlineExceeded, ResilientCall, is_transient, pooled_http_options
+
+from .config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DEADLINE,
+    EMBEDDING_HEDGE_QUANTILE,
+    EMBEDDING_KEEPALIVE_EXPIRY,
+    EMBEDDING_MAX_ATTEMPTS,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MODEL,
+    EMBEDDING_POOL_SIZE,
+    EMBEDDING_RETRY_BACKOFF,
+    EMBEDDING_STORE_DIR,
+    EMBEDDING_WRITE_CHUNK,
+    HYBRID_ALPHA,
+    HYBRID_CANDIDATES,
+    IVF_N_LISTS,
+    IVF_N_PROBE,
+    KB_INDEX_BACKEND,
+    KB_PATH,
+    KB_PRECISION,
+    KB_RESCORE_FACTOR,
+    LEXICAL_MARGIN,
+    LEXICAL_SHORTCUT_THRESHOLD,
+    QUERY_BATCH_MAX_SIZE,
+    QUERY_BATCH_WINDOW,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL,
+    SHARED_INDEX_CHECK_INTERVAL,
+    SHARED_INDEX_DIR,
+)
+from . import shared_index
+from .embedding_store import EmbeddingStore
+from .index import ExactIndex, VectorIndex, build_index, quantization_recall, recall_at_k, top_k
+from .ingest import embed_texts
+from .knowledge_base import KnowledgeBase, load_knowledge_base
+from .lexical import BM25Index
+from .query_cache import QueryCache
+
+logger = logging.getLogger(__name__)
 
 # Predefined Q&A Dataset
 QA_DATASET = [
@@ -55,58 +106,392 @@ QA_DATASET = [
     }
 ]
 
-# Cache for embeddings to avoid re-computing
-_EMBEDDINGS_CACHE: Optional[List[Dict]] = None
+class KBSnapshot(NamedTuple):
+    """Knowledge base plus its indexes; row i of `index` <-> row i of `kb`.
+
+    Swapped as a whole, so a search never mixes rows from two generations.
+    """
+    kb: KnowledgeBase
+    index: VectorIndex
+    lexical: BM25Index
+    generation: int = 0
+
+_SNAPSHOT: Optional[KBSnapshot] = None
+_WATCHER: Optional[shared_index.GenerationWatcher] = None
 _CLIENT: Optional[genai.Client] = None
+_QUERY_CACHE: QueryCache[List[float]] = QueryCache(max_size=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+
+# Single-flight initialization: threads serialize on the lock, coroutines await one shared task
+_INIT_LOCK = threading.Lock()
+_CLIENT_LOCK = threading.Lock()
+_INIT_TASK: Optional[asyncio.Task] = None
+
+# Query-time settings for indexes attached from a shared snapshot
+_INDEX_PARAMS = {"n_probe": IVF_N_PROBE, "rescore": KB_RESCORE_FACTOR}
 
-def _get_client():
+# Threshold from Thoughtful_AI strategy
+MATCH_THRESHOLD = 0.70
+
+def _new_client() -> genai.Client:
+    return genai.Client(http_options=pooled_http_options(
+        max_connections=EMBEDDING_POOL_SIZE,
+        keepalive_expiry=EMBEDDING_KEEPALIVE_EXPIRY,
+    ))
+
+def _get_client() -> genai.Client:
     global _CLIENT
     if _CLIENT is None:
-        _CLIENT = genai.Client()
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _new_client()
     return _CLIENT
 
-def _get_embedding(text: str) -> List[float]:
-    """Get embedding for text using Gemini."""
+# One client per event loop for async calls: pooled async connections belong to the loop that opened them
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = weakref.WeakKeyDictionary()
+
+def _get_async_client() -> genai.Client:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = _ASYNC_CLIENTS[loop] = _new_client()
+    return client
+
+def _embed_config(timeout: Optional[float]):
+    """Per-request config carrying the time left before the caller's deadline."""
+    if timeout is None:
+        return None
+    return types.EmbedContentConfig(http_options=types.HttpOptions(timeout=max(1, int(timeout * 1000))))
+
+def _get_embeddings(texts: List[str], kind: str = "batch", timeout: Optional[float] = None) -> List[List[float]]:
+    """Get embeddings for a batch of texts in a single Gemini request."""
     client = _get_client()
-    result = client.models.embed_content(
-        model="text-embedding-004",
-        contents=text
-    )
-    # Handle different response structures if needed, but this is standard
-    return result.embeddings[0].values
-
-def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    if not v1 or not v2 or len(v1) != len(v2):
-        return 0.0
-    
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude1 = sum(a * a for a in v1) ** 0.5
-    magnitude2 = sum(b * b for b in v2) ** 0.5
-    
-    if magnitude1 * magnitude2 == 0:
-        return 0.0
-        
-    return dot_product / (magnitude1 * magnitude2)
+    with metrics.timed("thoughtful_embedding_latency_seconds", kind=kind):
+        result = client.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=texts,
+            config=_embed_config(timeout),
+        )
+    return [embedding.values for embedding in result.embeddings]
+
+async def _aget_embeddings(texts: List[str], kind: str = "batch",
+                           timeout: Optional[float] = None) -> List[List[float]]:
+    """Async variant of `_get_embeddings` (does not block the event loop)."""
+    client = _get_async_client()
+    with metrics.timed("thoughtful_embedding_latency_seconds", kind=kind):
+        result = await client.aio.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=texts,
+            config=_embed_config(timeout),
+        )
+    return [embedding.values for embedding in result.embeddings]
+
+# Query embeddings run under a deadline with jittered retries and p95-based hedging
+_EMBED_CALL = ResilientCall(
+    "thoughtful_query_embedding",
+    CallPolicy(
+        deadline=EMBEDDING_DEADLINE,
+        max_attempts=EMBEDDING_MAX_ATTEMPTS,
+        backoff=EMBEDDING_RETRY_BACKOFF,
+        hedge_quantile=EMBEDDING_HEDGE_QUANTILE,
+    ),
+    retryable=is_transient,
+)
+
+# Concurrent query embeddings are coalesced into one batched request per window
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+def _embed_query_batch(texts: List[str]) -> List[List[float]]:
+    metrics.observe("thoughtful_query_batch_size", len(texts), buckets=BATCH_SIZE_BUCKETS)
+    return _EMBED_CALL.call(lambda timeout: _get_embeddings(texts, kind="query", timeout=timeout))
+
+async def _aembed_query_batch(texts: List[str]) -> List[List[float]]:
+    metrics.observe("thoughtful_query_batch_size", len(texts), buckets=BATCH_SIZE_BUCKETS)
+    return await _EMBED_CALL.acall(lambda timeout: _aget_embeddings(texts, kind="query", timeout=timeout))
+
+_QUERY_BATCHER = MicroBatcher(_embed_query_batch, window=QUERY_BATCH_WINDOW, max_batch=QUERY_BATCH_MAX_SIZE)
+# One async batcher per event loop (its futures and timers belong to that loop)
+_ASYNC_QUERY_BATCHERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMicroBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _get_embedding(text: str) -> List[float]:
+    """Get embedding for text using Gemini; concurrent callers share one batched request."""
+    return _QUERY_BATCHER.submit(text)
+
+async def _aget_embedding(text: str) -> List[float]:
+    """Async variant of `_get_embedding`."""
+    loop = asyncio.get_running_loop()
+    batcher = _ASYNC_QUERY_BATCHERS.get(loop)
+    if batcher is None:
+        batcher = _ASYNC_QUERY_BATCHERS[loop] = AsyncMicroBatcher(
+            _aembed_query_batch, window=QUERY_BATCH_WINDOW, max_batch=QUERY_BATCH_MAX_SIZE
+        )
+    return await batcher.submit(text)
+
+def _embed_query(query: str) -> List[float]:
+    """Embed a user query, serving repeated (normalized) queries from the cache."""
+    return _QUERY_CACHE.get_or_compute(query, _get_embedding)
+
+async def _aembed_query(query: str) -> List[float]:
+    """Async variant of `_embed_query`."""
+    embedding = _QUERY_CACHE.get(query)
+    if embedding is None:
+        embedding = await _aget_embedding(query)
+        _QUERY_CACHE.put(query, embedding)
+    return embedding
+
+def get_query_cache_stats() -> Dict[str, float]:
+    """Return size, hit/miss counters and hit rate of the query embedding cache."""
+    return _QUERY_CACHE.stats()
+
+def _collect_cache_metrics():
+    for stat, value in _QUERY_CACHE.stats().items():
+        yield f"thoughtful_query_cache_{stat}", {}, value
+
+metrics.REGISTRY.register_collector(_collect_cache_metrics)
+metrics.REGISTRY.describe("thoughtful_embedding_latency_seconds", "Embedding round-trips (query or batch).")
+metrics.REGISTRY.describe("thoughtful_query_batch_size", "Queries per coalesced query embedding request.")
+metrics.REGISTRY.describe("thoughtful_kb_degraded_total", "Searches answered from the lexical index because the query embedding failed.")
+metrics.REGISTRY.describe("thoughtful_kb_match_score", "Best knowledge base match score per search.")
+metrics.REGISTRY.register_collector(
+    lambda: [("thoughtful_kb_generation", {}, _SNAPSHOT.generation)] if _SNAPSHOT is not None else []
+)
 
 def _initialize_knowledge_base():
-    """Lazy load and embed the knowledge base."""
-    global _EMBEDDINGS_CACHE
-    if _EMBEDDINGS_CACHE is not None:
+    """Lazy load and embed the knowledge base (thread-safe, built at most once)."""
+    if _SNAPSHOT is not None:
+        return
+    with _INIT_LOCK:
+        if _SNAPSHOT is None:
+            _build_knowledge_base()
+
+async def _ainitialize_knowledge_base():
+    """Await the knowledge base build; concurrent callers share a single build."""
+    global _INIT_TASK
+    if _SNAPSHOT is not None:
         return
+    task = _INIT_TASK
+    if task is None or task.get_loop() is not asyncio.get_running_loop() or (
+        task.done() and task.exception() is not None
+    ):
+        # The blocking build (store I/O + batched embedding) runs off the event loop
+        task = _INIT_TASK = asyncio.ensure_future(asyncio.to_thread(_initialize_knowledge_base))
+    await asyncio.shield(task)
+
+def _build_knowledge_base():
+    global _SNAPSHOT, _WATCHER
+    if not SHARED_INDEX_DIR:
+        kb, index = _build_from_source()
+        _SNAPSHOT, _WATCHER = KBSnapshot(kb, index, BM25Index(kb.questions)), None
+        return
+    fingerprint = _source_fingerprint()
+    shared = shared_index.attach(SHARED_INDEX_DIR, fingerprint, **_INDEX_PARAMS)
+    if shared is None:
+        with shared_index.publish_lock(SHARED_INDEX_DIR):
+            # Another worker may have published while we waited for the lock
+            shared = shared_index.attach(SHARED_INDEX_DIR, fingerprint, **_INDEX_PARAMS)
+            if shared is None:
+                kb, index = _build_from_source()
+                shared_index.publish(SHARED_INDEX_DIR, kb, index, fingerprint, lexical=BM25Index(kb.questions))
+                shared = shared_index.attach(SHARED_INDEX_DIR, fingerprint, **_INDEX_PARAMS)
+    _SNAPSHOT = _from_shared(shared)
+    _WATCHER = shared_index.GenerationWatcher(SHARED_INDEX_DIR, SHARED_INDEX_CHECK_INTERVAL)
+
+def _source_fingerprint() -> str:
+    """Identifies the data and settings a published snapshot was built from."""
+    if KB_PATH:
+        stat = os.stat(KB_PATH)
+        source = [os.path.abspath(KB_PATH), stat.st_size, stat.st_mtime_ns]
+    else:
+        source = QA_DATASET
+    payload = json.dumps([EMBEDDING_MODEL, KB_INDEX_BACKEND, KB_PRECISION, IVF_N_LISTS, source], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _from_shared(shared: shared_index.SharedSnapshot) -> KBSnapshot:
+    logger.info("Attached shared knowledge base generation %d (%d items).", shared.generation, len(shared.kb))
+    # The BM25 index is published with the snapshot; only older generations lack it
+    lexical = shared.lexical if shared.lexical is not None else BM25Index(shared.kb.questions)
+    return KBSnapshot(shared.kb, shared.index, lexical, shared.generation)
 
-    print("Initializing knowledge base embeddings...")
-    _EMBEDDINGS_CACHE = []
-    for item in QA_DATASET:
-        embedding = _get_embedding(item["question"])
-        _EMBEDDINGS_CACHE.append({
-            "question": item["question"],
-            "answer": item["answer"],
-            "embedding": embedding
-        })
-    print(f"Knowledge base initialized with {len(_EMBEDDINGS_CACHE)} items.")
-
-def search_knowledge_base(query: str) -> str:
+def publish_knowledge_base() -> int:
+    """Rebuild the knowledge base from source and publish it as a new shared generation.
+
+    Running workers swap to it on their next search. Returns the new generation.
+    """
+    if not SHARED_INDEX_DIR:
+        raise RuntimeError("THOUGHTFUL_SHARED_INDEX is not set")
+    with shared_index.publish_lock(SHARED_INDEX_DIR):
+        kb, index = _build_from_source()
+        return shared_index.publish(SHARED_INDEX_DIR, kb, index, _source_fingerprint(),
+                                    lexical=BM25Index(kb.questions))
+
+def _stale() -> bool:
+    """True if a newer shared generation has been published than the one in use."""
+    if _WATCHER is None or _SNAPSHOT is None:
+        return False
+    latest = _WATCHER.latest()
+    return latest is not None and latest > _SNAPSHOT.generation
+
+def _swap_snapshot():
+    """Attach the newest shared generation, unless another caller is already doing so.
+
+    Never waits for the lock: while one caller swaps, the rest keep serving the
+    current snapshot.
+    """
+    global _SNAPSHOT
+    if not _INIT_LOCK.acquire(blocking=False):
+        return
+    try:
+        if _stale():
+            shared = shared_index.attach(SHARED_INDEX_DIR, **_INDEX_PARAMS)
+            if shared is not None:
+                _SNAPSHOT = _from_shared(shared)
+    finally:
+        _INIT_LOCK.release()
+
+def _get_snapshot() -> KBSnapshot:
+    """The current knowledge base, initializing it or swapping in a newer generation as needed."""
+    _initialize_knowledge_base()
+    if _stale():
+        _swap_snapshot()
+    return _SNAPSHOT
+
+async def _aget_snapshot() -> KBSnapshot:
+    """Async variant of `_get_snapshot`; attaching (file I/O) runs off the event loop."""
+    await _ainitialize_knowledge_base()
+    if _stale():
+        await asyncio.to_thread(_swap_snapshot)
+    return _SNAPSHOT
+
+def _build_from_source() -> Tuple[KnowledgeBase, VectorIndex]:
+    logger.info("Initializing knowledge base embeddings...")
+    kb = load_knowledge_base(KB_PATH) if KB_PATH else KnowledgeBase.from_records(QA_DATASET)
+    store = EmbeddingStore(EMBEDDING_STORE_DIR, EMBEDDING_MODEL)
+    rows = store.resolve_rows(
+        kb.questions,
+        lambda texts: embed_texts(
+            texts,
+            _get_embeddings,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            max_concurrency=EMBEDDING_MAX_CONCURRENCY,
+        ),
+        chunk_size=EMBEDDING_WRITE_CHUNK,
+    )
+    rng = np.random.default_rng(0)
+    if KB_PRECISION != "float32" and len(rows):
+        # Codes are built chunk by chunk from the store's memory map, which also serves
+        # re-scoring, so no float32 copy of the matrix stays resident
+        index = build_index(store.vectors, KB_INDEX_BACKEND, precision=KB_PRECISION,
+                            rows=rows, rescore=KB_RESCORE_FACTOR)
+        sample = store.take(rows[rng.choice(len(rows), min(20, len(rows)), replace=False)])
+        recall = quantization_recall(index, sample, k=10)
+        logger.info("%s recall@10 vs exact: %.3f re-scored, %.3f scan only",
+                    KB_PRECISION, recall["rescored"], recall["scan_only"])
+        logger.info("Knowledge base initialized with %d items.", len(index))
+        return kb, index
+
+    embeddings = store.take(rows)
+    if KB_INDEX_BACKEND == "ivf":
+        index = build_index(embeddings, "ivf", n_lists=IVF_N_LISTS, n_probe=IVF_N_PROBE)
+        sample = embeddings[rng.choice(len(embeddings), min(100, len(embeddings)), replace=False)]
+        logger.info("IVF recall@10 vs exact: %.3f", recall_at_k(index, ExactIndex(embeddings), sample, k=10))
+    else:
+        index = build_index(embeddings, KB_INDEX_BACKEND)
+    logger.info("Knowledge base initialized with %d items.", len(index))
+    return kb, index
+
+def search_top_k(query: str, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """Embed `query` and return the top-k semantic (cosine) scores and knowledge base row indices.
+
+    Scores are sorted in descending order; indices map into the loaded knowledge base
+    (`QA_DATASET` order unless THOUGHTFUL_KB_PATH points at an export).
+    """
+    return _get_snapshot().index.search(_embed_query(query), k)
+
+def _lexical_shortcut(kb: KnowledgeBase, lexical_scores: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Return the lexical best hit if it is confident and unambiguous, else None.
+
+    Confident: normalized BM25 >= LEXICAL_SHORTCUT_THRESHOLD. Unambiguous: no runner-up
+    within LEXICAL_MARGIN points to a different answer (paraphrases share answers).
+    """
+    scores, rows = top_k(lexical_scores, HYBRID_CANDIDATES)
+    if not len(scores) or scores[0] < LEXICAL_SHORTCUT_THRESHOLD:
+        return None
+    best_answer = kb.answer_ids[int(rows[0])]
+    for score, row in zip(scores[1:], rows[1:]):
+        if score >= scores[0] - LEXICAL_MARGIN and kb.answer_ids[int(row)] != best_answer:
+            return None
+    return scores[:1], rows[:1]
+
+def _hybrid_rank(semantic_scores: np.ndarray, rows: np.ndarray,
+                 lexical_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Blend lexical evidence into semantic candidates; lexical matches can only raise a score."""
+    blended = HYBRID_ALPHA * semantic_scores + (1 - HYBRID_ALPHA) * lexical_scores[rows]
+    hybrid = np.maximum(semantic_scores, blended)
+    order = np.argsort(hybrid)[::-1]
+    return hybrid[order], rows[order]
+
+class KBMatch(NamedTuple):
+    """Best knowledge base hit for a query; `answer` is None below MATCH_THRESHOLD."""
+    score: float
+    answer: Optional[str]
+    path: str
+
+def _to_match(kb: KnowledgeBase, scores: np.ndarray, indices: np.ndarray, path: str) -> KBMatch:
+    best_score = float(scores[0]) if len(scores) else 0.0
+    metrics.observe("thoughtful_kb_match_score", best_score, buckets=metrics.SCORE_BUCKETS, path=path)
+    answer = kb.answer(int(indices[0])) if best_score >= MATCH_THRESHOLD else None
+    return KBMatch(best_score, answer, path)
+
+def _degraded_match(kb: KnowledgeBase, lexical_scores: np.ndarray, error: Exception) -> KBMatch:
+    """Lexical-only ranking for when the query embedding missed its deadline or failed."""
+    reason = "deadline" if isinstance(error, DeadlineExceeded) else "error"
+    logger.warning("Query embedding unavailable (%s: %s); answering from the lexical index",
+                   type(error).__name__, error)
+    metrics.inc("thoughtful_kb_degraded_total", reason=reason)
+    return _to_match(kb, *top_k(lexical_scores, 1), path="degraded")
+
+def find_best_match(query: str) -> KBMatch:
+    """Rank `query` against the knowledge base (lexical fast path, then hybrid)."""
+    snapshot = _get_snapshot()
+    lexical_scores = snapshot.lexical.scores(query)
+    shortcut = _lexical_shortcut(snapshot.kb, lexical_scores)
+    if shortcut is not None:
+        return _to_match(snapshot.kb, *shortcut, path="lexical")
+    try:
+        embedding = _embed_query(query)
+    except Exception as e:
+        if not is_transient(e):
+            raise
+        return _degraded_match(snapshot.kb, lexical_scores, e)
+    scores, rows = snapshot.index.search(embedding, HYBRID_CANDIDATES)
+    return _to_match(snapshot.kb, *_hybrid_rank(scores, rows, lexical_scores), path="hybrid")
+
+async def find_best_match_async(query: str) -> KBMatch:
+    """Async variant of `find_best_match`; never blocks the event loop on network calls."""
+    snapshot = await _aget_snapshot()
+    lexical_scores = snapshot.lexical.scores(query)
+    shortcut = _lexical_shortcut(snapshot.kb, lexical_scores)
+    if shortcut is not None:
+        return _to_match(snapshot.kb, *shortcut, path="lexical")
+    try:
+        embedding = await _aembed_query(query)
+    except Exception as e:
+        if not is_transient(e):
+            raise
+        return _degraded_match(snapshot.kb, lexical_scores, e)
+    scores, rows = snapshot.index.search(embedding, HYBRID_CANDIDATES)
+    return _to_match(snapshot.kb, *_hybrid_rank(scores, rows, lexical_scores), path="hybrid")
+
+def _format_match(match: KBMatch) -> str:
+    """Render the best hit as the tool's tagged result string."""
+    if match.answer is not None:
+        return f"[Match Found (Score: {match.score:.2f})] {match.answer}"
+    else:
+        return f"[No High Confidence Match (Best Score: {match.score:.2f})] No exact match found in knowledge base."
+
+@metrics.instrument_tool
+async def search_knowledge_base(query: str) -> str:
     """Search the Thoughtful AI knowledge base for answers about products (EVA, CAM, PHIL).
 
     This tool uses semantic matching to find precise answers from the verified Q&A dataset.
@@ -116,28 +501,19 @@ def search_knowledge_base(query: str) -> str:
         query: The user's question or search query.
 
     Returns:
-        str: The exact answer if a match is found (confidence > 0.8), or a message indicating no match.
+        str: The exact answer if a match is found (score >= 0.70), or a message indicating no match.
     """
     try:
-        _initialize_knowledge_base()
-        
-        query_embedding = _get_embedding(query)
-        best_match = None
-        best_score = 0.0
-        
-        for item in _EMBEDDINGS_CACHE:
-            score = _cosine_similarity(query_embedding, item["embedding"])
-            if score > best_score:
-                best_score = score
-                best_match = item["answer"]
-        
-        # Threshold from Thoughtful_AI strategy
-        threshold = 0.70
-        
-        if best_score >= threshold:
-            return f"[Match Found (Score: {best_score:.2f})] {best_match}"
-        else:
-            return f"[No High Confidence Match (Best Score: {best_score:.2f})] No exact match found in knowledge base."
-            
+        return _format_match(await find_best_match_async(query))
+    except Exception as e:
+        metrics.inc("thoughtful_kb_search_errors_total", error=type(e).__name__)
+        return f"Error searching knowledge base: {str(e)}"
+
+@metrics.instrument_tool
+def search_knowledge_base_sync(query: str) -> str:
+    """Blocking variant of `search_knowledge_base` for scripts, benchmarks and the CLI."""
+    try:
+        return _format_match(find_best_match(query))
     except Exception as e:
+        metrics.inc("thoughtful_kb_search_errors_total", error=type(e).__name__)
         return f"Error searching knowledge base: {str(e)}"